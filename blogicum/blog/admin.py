@@ -1,17 +1,84 @@
+from django import forms
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.core.cache import cache
+from django.forms.utils import flatatt
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.text import capfirst
 
-from .models import Category, Location, Post
+from . import deletion, versions
+from .models import Category, Location, PendingDeletion, Post
+from .paginators import EstimatedCountPaginator
+
+User = get_user_model()
 
 admin.site.empty_value_display = 'Не задано'
 
+RECENT_POSTS = 10
+
+
+def category_choices(field):
+    key = 'blog:admin:category_choices:{}'.format(
+        *versions.marks(versions.CATEGORIES))
+    choices = cache.get(key)
+    if choices is None:
+        choices = [(getattr(value, 'value', value), label)
+                   for value, label in field.choices]
+        cache.set(key, choices)
+    return choices
+
+
+class ChangelistSelect(forms.Select):
+    """<select> rendered without a template per <option>."""
+
+    def render(self, name, value, attrs=None, renderer=None):
+        value = '' if value is None else str(value)
+        options = format_html_join(
+            '', '<option value="{}"{}>{}</option>',
+            ((option, ' selected' if str(option) == value else '', label)
+             for option, label in self.choices),
+        )
+        return format_html('<select name="{}"{}>{}</select>', name,
+                           flatatt(self.build_attrs(self.attrs, attrs)),
+                           options)
+
 
-class PostInLine(admin.StackedInline):
-    model = Post
-    extra = 0
+class LargeDeletionMixin:
+    """
+    The delete confirmation page lists every related row by default,
+    which loads whole comment trees. Above DELETE_SYNC_LIMIT rows it
+    shows the count per model instead. Subclasses set `related_rows`
+    to the function counting rows deleted along with the given pks.
+    """
+
+    def get_deleted_objects(self, objs, request):
+        objs = list(objs)
+        rows = self.related_rows([obj.pk for obj in objs])
+        if sum(rows.values()) <= settings.DELETE_SYNC_LIMIT:
+            return super().get_deleted_objects(objs, request)
+        opts = self.model._meta
+        model_count = {opts.verbose_name_plural: len(objs)}
+        perms_needed = set()
+        for model, count in rows.items():
+            if not count:
+                continue
+            model_count[model._meta.verbose_name_plural] = count
+            model_admin = self.admin_site._registry.get(model)
+            if (model_admin is not None
+                    and not model_admin.has_delete_permission(request)):
+                perms_needed.add(model._meta.verbose_name)
+        deleted_objects = [
+            format_html('{}: {}', capfirst(opts.verbose_name), obj)
+            for obj in objs
+        ]
+        return deleted_objects, model_count, perms_needed, []
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(LargeDeletionMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'pub_date',
@@ -31,14 +98,79 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('category',)
     list_display_links = ('title',)
 
+    # Large tables: one query for the rows and their foreign keys, an
+    # estimated count and no second COUNT(*) of the whole table.
+    autocomplete_fields = ('author', 'location', 'category')
+    list_select_related = ('author', 'location', 'category')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist_form(self, request, **kwargs):
+        kwargs.setdefault('widgets', {'category': ChangelistSelect})
+        return super().get_changelist_form(request, **kwargs)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        field = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if isinstance(field.widget, ChangelistSelect):
+            # Rendered once per row of the changelist: every <select>
+            # would run its own query otherwise.
+            field.choices = category_choices(field)
+        return field
+
+    related_rows = staticmethod(deletion.post_rows)
+
+    def delete_model(self, request, obj):
+        deletion.delete_post(obj)
+
+    def delete_queryset(self, request, queryset):
+        for post in queryset:
+            deletion.delete_post(post)
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    inlines = (
-        PostInLine,
-    )
+    # A category may hold thousands of posts: show the latest few and
+    # link to the filtered changelist instead of an inline form per post.
+    readonly_fields = ('recent_posts',)
+    search_fields = ('title',)
+
+    @admin.display(description='Последние публикации')
+    def recent_posts(self, obj):
+        if obj.pk is None:
+            return self.get_empty_value_display()
+        posts = obj.posts.only('id', 'title').order_by('-id')[:RECENT_POSTS]
+        items = format_html_join('', '<li><a href="{}">{}</a></li>', (
+            (reverse('admin:blog_post_change', args=(post.id,)), post.title)
+            for post in posts
+        ))
+        return format_html(
+            '<ul>{}</ul><a href="{}?category__id__exact={}">'
+            'Все публикации категории</a>',
+            items, reverse('admin:blog_post_changelist'), obj.pk,
+        )
 
 
 @admin.register(Location)
 class LocationAdmin(admin.ModelAdmin):
-    pass
+    search_fields = ('name',)
+
+
+@admin.register(PendingDeletion)
+class PendingDeletionAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'requested_at')
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class BlogUserAdmin(LargeDeletionMixin, UserAdmin):
+    # Users with large comment trees go to reap_deletions.
+    related_rows = staticmethod(deletion.user_rows)
+
+    def delete_model(self, request, obj):
+        deletion.delete_user(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            deletion.delete_user(user)
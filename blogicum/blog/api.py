@@ -0,0 +1,248 @@
+"""
+Read-only JSON API.
+Posts are paged with keyset cursors over (pub_date, id), ``?fields=``
+limits the SELECT list to the requested columns, comment lists are
+streamed row by row and batch lookups go through a per-post cache.
+"""
+import json
+from functools import wraps
+
+from django.core.cache import cache
+from django.core.exceptions import BadRequest
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Case, Count, F, When
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+
+from . import keyset, versions
+from .models import Category, Comment, Post
+
+PAGE_SIZE = 10
+
+MAX_PAGE_SIZE = 100
+
+BATCH_SIZE = 100
+
+POST_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Output name -> lookup or expression selecting it.
+POST_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': Case(When(location__is_published=True,
+                          then=F('location__name'))),
+    'image': 'image',
+    'comment_count': Count('comments'),
+}
+
+COMMENT_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'created_at': 'created_at',
+    'author': 'author__username',
+}
+
+CATEGORY_FIELDS = {
+    'slug': 'slug',
+    'title': 'title',
+    'description': 'description',
+}
+
+CONVERTERS = {
+    'image': lambda name: default_storage.url(name) if name else None,
+}
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, safe=False,
+                        json_dumps_params={'ensure_ascii': False})
+
+
+def api_view(view):
+    """Answer GET only and report errors as JSON instead of HTML pages."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return json_response({'error': 'Method not allowed'}, 405)
+        try:
+            return view(request, *args, **kwargs)
+        except BadRequest as error:
+            return json_response({'error': str(error)}, 400)
+        except Http404 as error:
+            return json_response({'error': str(error)}, 404)
+    return wrapper
+
+
+def requested_fields(request, spec):
+    if 'fields' not in request.GET:
+        return list(spec)
+    fields = [name for name in request.GET['fields'].split(',') if name]
+    unknown = set(fields) - spec.keys()
+    if unknown or not fields:
+        raise BadRequest(
+            f'Unknown fields: {", ".join(sorted(unknown))}' if unknown
+            else 'No fields requested'
+        )
+    return fields
+
+
+def select(queryset, fields, spec, extra=()):
+    """
+    Return a values() queryset with only `fields` (plus `extra` lookups)
+    and a function turning its rows into output dicts.
+    """
+    lookups, annotations, keys = list(extra), {}, {}
+    for name in fields:
+        source = spec[name]
+        if isinstance(source, str):
+            lookups.append(source)
+            keys[name] = source
+        else:
+            annotations[f'api_{name}'] = source
+            keys[name] = f'api_{name}'
+
+    def to_json(row):
+        return {
+            name: CONVERTERS.get(name, lambda value: value)(row[key])
+            for name, key in keys.items()
+        }
+    return queryset.annotate(**annotations).values(
+        *lookups, *annotations), to_json
+
+
+def page_size(request):
+    try:
+        size = int(request.GET.get('limit', PAGE_SIZE))
+    except ValueError:
+        raise BadRequest('Invalid limit')
+    return min(max(size, 1), MAX_PAGE_SIZE)
+
+
+@api_view
+def posts(request):
+    queryset = Post.objects.published().order_by('-pub_date', '-id')
+    if 'category' in request.GET:
+        queryset = queryset.filter(category__slug=request.GET['category'])
+    queryset = keyset.after(queryset, request.GET.get('cursor'))
+
+    size = page_size(request)
+    rows, to_json = select(queryset, requested_fields(request, POST_FIELDS),
+                           POST_FIELDS, extra=('id', 'pub_date'))
+    rows = list(rows[:size + 1])
+    return json_response({
+        'results': [to_json(row) for row in rows[:size]],
+        'next_cursor': keyset.encode_cursor(rows[size - 1]['pub_date'],
+                                            rows[size - 1]['id'])
+        if len(rows) > size else None,
+    })
+
+
+@api_view
+def post_detail(request, post_id):
+    rows, to_json = select(
+        Post.objects.published().filter(pk=post_id),
+        requested_fields(request, POST_FIELDS),
+        POST_FIELDS,
+    )
+    row = rows.first()
+    if row is None:
+        raise Http404('Post does not exist')
+    return json_response(to_json(row))
+
+
+def cached_posts(ids):
+    """
+    Return {id: output dict} for the visible posts among `ids`.
+    Entries are cached per post under the marks of everything that shows
+    up in them, so warm posts cost no query and the rest take one.
+    """
+    marks = versions.marks(
+        versions.CATEGORIES, versions.LOCATIONS, versions.USERS,
+        *map(versions.post_scope, ids),
+    )
+    shared = ':'.join(map(str, marks[:3]))
+    keys = {
+        post_id: f'blog:api:post:{post_id}:{shared}:{mark}'
+        for post_id, mark in zip(ids, marks[3:])
+    }
+    found = cache.get_many(keys.values())
+    posts = {post_id: found[key] for post_id, key in keys.items()
+             if key in found}
+
+    missing = [post_id for post_id in ids if post_id not in posts]
+    if missing:
+        rows, to_json = select(
+            Post.objects.published().filter(id__in=missing),
+            list(POST_FIELDS), POST_FIELDS,
+        )
+        fetched = {row['id']: to_json(row) for row in rows}
+        # Hidden posts are cached as None until one of their marks moves.
+        fetched.update({
+            post_id: None for post_id in missing if post_id not in fetched
+        })
+        cache.set_many({keys[post_id]: post for post_id, post
+                        in fetched.items()}, timeout=POST_CACHE_TIMEOUT)
+        posts.update(fetched)
+    return {post_id: post for post_id, post in posts.items() if post}
+
+
+def requested_ids(request):
+    try:
+        ids = [int(value) for value in request.GET.get('ids', '').split(',')
+               if value]
+    except ValueError:
+        raise BadRequest('Invalid ids')
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise BadRequest('No ids requested')
+    if len(ids) > BATCH_SIZE:
+        raise BadRequest(f'At most {BATCH_SIZE} ids per request')
+    return ids
+
+
+@api_view
+def posts_batch(request):
+    ids = requested_ids(request)
+    fields = requested_fields(request, POST_FIELDS)
+    posts = cached_posts(ids)
+    return json_response({
+        'results': [
+            {name: posts[post_id][name] for name in fields}
+            for post_id in ids if post_id in posts
+        ],
+        'missing': [post_id for post_id in ids if post_id not in posts],
+    })
+
+
+@api_view
+def post_comments(request, post_id):
+    if not Post.objects.published().filter(pk=post_id).exists():
+        raise Http404('Post does not exist')
+    rows, to_json = select(
+        Comment.objects.alive().filter(post_id=post_id).order_by('id'),
+        requested_fields(request, COMMENT_FIELDS),
+        COMMENT_FIELDS,
+    )
+
+    def stream():
+        yield '['
+        for i, row in enumerate(rows.iterator()):
+            yield ',' if i else ''
+            yield json.dumps(to_json(row), cls=DjangoJSONEncoder,
+                             ensure_ascii=False)
+        yield ']'
+    return StreamingHttpResponse(stream(), content_type='application/json')
+
+
+@api_view
+def categories(request):
+    rows, to_json = select(
+        Category.objects.filter(is_published=True).order_by('title'),
+        requested_fields(request, CATEGORY_FIELDS),
+        CATEGORY_FIELDS,
+    )
+    return json_response({'results': [to_json(row) for row in rows]})
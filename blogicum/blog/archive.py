@@ -0,0 +1,167 @@
+"""
+Hot/cold split of posts.
+Visible posts older than the horizon move from Post to ArchivedPost,
+with their comments frozen as JSON, so the Post table and its indexes
+only hold the live part of the blog. Archive pages read one
+precomputed ArchiveMonth row instead of querying the posts; the list of
+months and the posts shown for a month are cached under the change
+marks, while the pages around them are rendered per user.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone as tz
+from django.utils.dateparse import parse_datetime
+
+from . import deletion, stats, versions
+from .models import ArchivedPost, ArchiveMonth, Category, Comment, Post
+
+BATCH_SIZE = 500
+
+
+def horizon(now=None, days=None):
+    days = settings.ARCHIVE_HORIZON_DAYS if days is None else days
+    return (now or tz.now()) - timedelta(days=days)
+
+
+def month_of(moment):
+    moment = tz.localtime(moment)
+    return moment.year, moment.month
+
+
+def freeze_comments(post_ids):
+    comments = {post_id: [] for post_id in post_ids}
+    for comment in (Comment.objects.filter(post_id__in=post_ids)
+                    .select_related('author').order_by('created_at')):
+        comments[comment.post_id].append({
+            'id': comment.id,
+            'author': comment.author.username,
+            'text': comment.text,
+            'created_at': comment.created_at.isoformat(),
+        })
+    return comments
+
+
+def archive_batch(before, batch_size=BATCH_SIZE):
+    """
+    Move one batch of posts; return the months it touched, which the
+    caller rebuilds with rebuild_months().
+    """
+    with transaction.atomic():
+        posts = list(
+            Post.objects.filter(visible=True, pub_date__lt=before)
+            .order_by('pub_date')[:batch_size]
+        )
+        if not posts:
+            return set()
+        comments = freeze_comments([post.id for post in posts])
+        ArchivedPost.objects.bulk_create(
+            ArchivedPost(
+                id=post.id,
+                title=post.title,
+                text=post.text,
+                pub_date=post.pub_date,
+                image=post.image.name,
+                author_id=post.author_id,
+                location_id=post.location_id,
+                category_id=post.category_id,
+                created_at=post.created_at,
+                comments=comments[post.id],
+                comment_count=len(comments[post.id]),
+            )
+            for post in posts
+        )
+        post_ids = [post.id for post in posts]
+        deletion.delete_comments(Comment.objects.filter(post_id__in=post_ids))
+        Post.objects.filter(pk__in=post_ids).delete()
+        # The delete signals took the posts off their authors' profile
+        # totals, but an archived post still counts there.
+        archived = Counter(post.author_id for post in posts)
+        received = Counter()
+        for post in posts:
+            received[post.author_id] += len(comments[post.id])
+        for author_id, count in archived.items():
+            stats.bump(author_id, posts=count, published_posts=count,
+                       comments_received=received[author_id])
+    return {month_of(post.pub_date) for post in posts}
+
+
+def archive_posts(before, batch_size=BATCH_SIZE):
+    """
+    Archive every visible post published before `before` in batches of
+    short transactions; yields the months touched by each batch. The
+    touched months are rebuilt once, after the last batch.
+    """
+    touched = set()
+    while True:
+        months = archive_batch(before, batch_size)
+        if not months:
+            break
+        touched |= months
+        yield months
+    rebuild_months(touched)
+
+
+def summary(post):
+    return {
+        'id': post['id'],
+        'title': post['title'],
+        'pub_date': post['pub_date'].isoformat(),
+        'author': post['author__username'],
+        'category_id': post['category_id'],
+        'comment_count': post['comment_count'],
+    }
+
+
+def rebuild_months(months):
+    for year, month in months:
+        posts = (
+            ArchivedPost.objects.filter(pub_date__year=year,
+                                        pub_date__month=month)
+            .order_by('-pub_date')
+            .values('id', 'title', 'pub_date', 'author__username',
+                    'category_id', 'comment_count')
+        )
+        ArchiveMonth.objects.update_or_create(
+            year=year, month=month,
+            defaults={'posts': [summary(post) for post in posts]},
+        )
+    if months:
+        versions.touch(versions.ARCHIVE)
+
+
+def months():
+    """(year, month) of every archive month, oldest first."""
+    key = 'blog:archive:months:{}'.format(*versions.marks(versions.ARCHIVE))
+    found = cache.get(key)
+    if found is None:
+        found = list(ArchiveMonth.objects.values_list('year', 'month'))
+        cache.set(key, found)
+    return found
+
+
+def month_posts(year, month):
+    """
+    Summaries of the archived posts of a month shown to readers, or None
+    when the month is not in the archive.
+    """
+    key = 'blog:archive:month:{}:{}:{}:{}'.format(
+        year, month, *versions.marks(versions.ARCHIVE, versions.CATEGORIES))
+    found = cache.get(key)
+    if found is None:
+        archive = ArchiveMonth.objects.filter(year=year, month=month).first()
+        if archive is None:
+            return None
+        published = set(
+            Category.objects.filter(is_published=True)
+            .values_list('id', flat=True)
+        )
+        found = [
+            {**post, 'pub_date': parse_datetime(post['pub_date'])}
+            for post in archive.posts if post['category_id'] in published
+        ]
+        cache.set(key, found)
+    return found
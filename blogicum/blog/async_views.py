@@ -0,0 +1,52 @@
+"""
+Async variants of the read-only pages for the ASGI deployment.
+Under ASGI Django 3.2 runs every sync view in one shared thread, so a
+slow page holds up all others. These wrappers run the view, including
+its ORM queries and template rendering, in the thread pool instead and
+close its connection before giving the thread back; the event loop only
+sends the response, so slow clients cost a coroutine, not a thread.
+Only views that read and never open a transaction may be wrapped.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import Http404
+
+from . import live
+
+
+def database_sync_to_async(func):
+    def call(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(call, thread_sensitive=False)
+
+
+def in_thread_pool(view):
+    @database_sync_to_async
+    def call(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await call(request, *args, **kwargs)
+    return wrapper
+
+
+async def comment_stream(request, post_id):
+    """Waits for new comments on the event loop, see blog.live."""
+    after = live.last_event_id(request)
+    events = await database_sync_to_async(live.catch_up)(
+        request, post_id, after)
+    if events is None:
+        raise Http404('Page does not exist')
+    if not events:
+        events = await live.broker.wait_async(
+            post_id, after, live.STREAM_TIMEOUT)
+    return live.event_response(events)
@@ -0,0 +1,118 @@
+"""
+Buffered comment writes.
+With COMMENT_BUFFER on, add_comment queues the comment and a background
+thread inserts the queue every COMMENT_BUFFER_DELAY seconds: one short
+transaction holds a bulk INSERT and a single UPDATE of the posts'
+updated_at, instead of one write transaction per comment and another per
+post touch. bulk_create sends no post_save, so the caches, live
+streams and profile stats the signals would have updated are handled
+here. Queued comments are lost if the process is killed before a flush.
+A batch that fails to write goes back to the queue and is retried with
+the next flush, up to FLUSH_ATTEMPTS times.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone as tz
+
+from . import live, stats, versions
+from .models import Comment, Post
+
+logger = logging.getLogger(__name__)
+
+# Writes of a batch before its comments are dropped.
+FLUSH_ATTEMPTS = 3
+
+
+def write_comments(comments):
+    """Insert `comments` in one transaction; return how many were saved."""
+    now = tz.now()
+    post_ids = {comment.post_id for comment in comments}
+    with transaction.atomic():
+        # Write first: a SQLite transaction that reads before it writes
+        # fails with "database is locked" when another writer got there.
+        Post.objects.filter(pk__in=post_ids).update(updated_at=now)
+        # A post may have been deleted since its comment was queued.
+        authors = dict(
+            Post.objects.alive().filter(pk__in=post_ids)
+            .values_list('pk', 'author_id')
+        )
+        post_ids = set(authors)
+        comments = [c for c in comments if c.post_id in post_ids]
+        Comment.objects.bulk_create(comments)
+        received = Counter(authors[c.post_id] for c in comments)
+        for author_id, count in received.items():
+            stats.bump(author_id, comments_received=count)
+        stats.touch_activity(*{c.author_id for c in comments})
+    versions.touch(versions.COMMENTS, *map(versions.post_scope, post_ids))
+    for post_id in post_ids:
+        # SQLite returns no ids from bulk_create: the streams reconnect
+        # and read the new comments from the database.
+        live.broker.notify(post_id)
+    return len(comments)
+
+
+class CommentBuffer:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []
+        self._full = threading.Event()
+        self._thread = None
+        self._failures = 0
+
+    def add(self, comment):
+        with self._lock:
+            self._pending.append(comment)
+            if len(self._pending) >= settings.COMMENT_BUFFER_SIZE:
+                self._full.set()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='comment-buffer', daemon=True
+                )
+                self._thread.start()
+
+    def flush(self):
+        with self._lock:
+            comments, self._pending = self._pending, []
+            self._full.clear()
+        if not comments:
+            return 0
+        try:
+            saved = write_comments(comments)
+        except Exception:
+            self._requeue(comments)
+            raise
+        self._failures = 0
+        return saved
+
+    def _requeue(self, comments):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= FLUSH_ATTEMPTS:
+                self._failures = 0
+                logger.error('Dropped %d buffered comments after %d '
+                             'failed writes', len(comments), FLUSH_ATTEMPTS)
+                return
+            self._pending[:0] = comments
+
+    def _run(self):
+        while True:
+            self._full.wait(settings.COMMENT_BUFFER_DELAY)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Writing buffered comments failed')
+                # Give the database a moment before the retry.
+                self._full.clear()
+            finally:
+                close_old_connections()
+
+
+buffer = CommentBuffer()
+
+atexit.register(buffer.flush)
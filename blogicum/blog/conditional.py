@@ -0,0 +1,148 @@
+"""
+Conditional GET for the read-only pages.
+Feed validators come from change marks alone, so a matching request
+gets its 304 without touching the database; a post page adds one
+lookup by primary key.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from . import users, versions
+from .models import Post, PostQuerySet
+
+FEED_SCOPES = (
+    versions.POSTS,
+    versions.CATEGORIES,
+    versions.LOCATIONS,
+    versions.USERS,
+    versions.COMMENTS,
+    # The category sidebar on every page.
+    versions.CATEGORY_COUNTS,
+)
+
+
+def make_etag(request, *parts):
+    # Pages differ per user and embed the CSRF token in forms.
+    key = repr((
+        request.user.pk,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME),
+        request.GET.urlencode(),
+        *parts,
+    ))
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def feed_validators(request, *parts):
+    # Every write that can change a feed page touches one of FEED_SCOPES,
+    # so the marks are enough and no aggregate over the posts is needed.
+    etag = make_etag(request, versions.marks(*FEED_SCOPES), *parts)
+    return etag, versions.last_change(*FEED_SCOPES)
+
+
+def index_validators(request):
+    return feed_validators(request)
+
+
+def category_validators(request, category_slug):
+    return feed_validators(request, category_slug)
+
+
+def location_validators(request, location_id):
+    return feed_validators(request, location_id)
+
+
+def profile_validators(request, username):
+    author_id = users.user_id(username)
+    if author_id is None:
+        # Let the view answer 404.
+        return None, None
+    return feed_validators(request, author_id)
+
+
+def archive_validators(request, year=None, month=None):
+    # The header shows the user, so the pages are validated per user.
+    scopes = (versions.ARCHIVE, versions.CATEGORIES,
+              versions.CATEGORY_COUNTS)
+    etag = make_etag(request, versions.marks(*scopes), year, month)
+    return etag, versions.last_change(*scopes)
+
+
+def post_detail_validators(request, post_id):
+    post = (
+        Post.objects.filter(pk=post_id)
+        .values('visible', 'author_id', *PostQuerySet.updated_fields)
+        .first()
+    )
+    if post is None or not (post['visible']
+                            or post['author_id'] == request.user.pk):
+        # Let the view answer 404.
+        return None, None
+    scopes = (
+        versions.post_scope(post_id),
+        versions.CATEGORIES,
+        versions.LOCATIONS,
+        versions.USERS,
+        versions.CATEGORY_COUNTS,
+    )
+    last_modified = max(
+        versions.last_change(*scopes),
+        *filter(None, (post[field] for field in PostQuerySet.updated_fields)),
+    )
+    etag = make_etag(request, versions.marks(*scopes), post)
+    return etag, last_modified
+
+
+def conditional_page(validators):
+    """
+    Answer 304 when the client's copy is still valid.
+    `validators(request, **kwargs)` returns (etag, last_modified).
+    """
+    def cached_validators(request, *args, **kwargs):
+        if not hasattr(request, '_page_validators'):
+            request._page_validators = validators(request, *args, **kwargs)
+        return request._page_validators
+
+    def decorator(view):
+        @condition(
+            etag_func=lambda *a, **kw: cached_validators(*a, **kw)[0],
+            last_modified_func=lambda *a, **kw: cached_validators(*a, **kw)[1],
+        )
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
+
+
+def public_cache(*scopes, timeout=60 * 60 * 24):
+    """
+    Cache a page that is the same for every visitor under the change
+    marks of `scopes`: a write to any of them invalidates it. The marks
+    also give the validators, so a 304 costs no query at all.
+    """
+    def etag(request, *args, **kwargs):
+        key = repr((request.build_absolute_uri(), versions.marks(*scopes)))
+        return hashlib.md5(key.encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        return versions.last_change(*scopes)
+
+    def decorator(view):
+        @condition(etag_func=etag, last_modified_func=last_modified)
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key = f'blog:page:{etag(request)}'
+            response = cache.get(key)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                cache.set(key, response, timeout)
+            return response
+        return wrapper
+    return decorator
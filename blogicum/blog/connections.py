@@ -0,0 +1,60 @@
+"""
+Database connection metrics and health checks.
+Counts connections opened (and reused from blogicum.sqlite_pool) per
+process and logs the rate once a minute, so CONN_MAX_AGE and the pool
+size can be checked against real traffic.
+"""
+import logging
+import threading
+import time
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+REPORT_INTERVAL = 60
+
+
+class ConnectionStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.opened = self.reused = 0
+        self._window_start = time.monotonic()
+        self._window_opened = self._window_reused = 0
+
+    def record(self, reused):
+        now = time.monotonic()
+        with self._lock:
+            if reused:
+                self.reused += 1
+                self._window_reused += 1
+            else:
+                self.opened += 1
+                self._window_opened += 1
+            elapsed = now - self._window_start
+            if elapsed < REPORT_INTERVAL:
+                return
+            opened, reused = self._window_opened, self._window_reused
+            self._window_start = now
+            self._window_opened = self._window_reused = 0
+        logger.info(
+            '%.2f connection opens/s, %.2f reuses/s over the last %d s',
+            opened / elapsed, reused / elapsed, elapsed,
+        )
+
+    def snapshot(self):
+        with self._lock:
+            return {'opened': self.opened, 'reused': self.reused}
+
+
+stats = ConnectionStats()
+
+
+def check_connections():
+    """Close broken persistent connections before a request uses them."""
+    for connection in connections.all():
+        if (connection.connection is not None
+                and connection.settings_dict.get('CONN_HEALTH_CHECKS')
+                and not connection.is_usable()):
+            connection.close()
@@ -0,0 +1,161 @@
+"""
+Deferred deletion of posts and users with large comment trees.
+Deleting either cascades to every comment in one transaction, which
+holds the SQLite write lock for as long as the DELETE runs. Objects with
+more than DELETE_SYNC_LIMIT dependent rows are hidden at once and get a
+PendingDeletion tombstone instead; `manage.py reap_deletions` then
+removes their comments and posts in short batches.
+Comments are always deleted through delete_comments(): one stats update
+per author and one change-mark touch per batch instead of the two
+UPDATEs the delete receivers would run for every comment.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone as tz
+
+from . import stats, users, versions
+from .models import Comment, PendingDeletion, Post
+from .signals import batched_comment_deletes, posts_visibility_changed
+
+User = get_user_model()
+
+BATCH_SIZE = 200
+
+
+def hide_posts(posts):
+    post_ids = list(posts.values_list('pk', flat=True))
+    if post_ids:
+        Post.objects.filter(pk__in=post_ids).update(
+            visible=False, is_published=False, updated_at=tz.now())
+        posts_visibility_changed.send(sender=Post, post_ids=post_ids)
+
+
+def delete_comments(comments):
+    """Delete the `comments` queryset; return the number of rows."""
+    rows = list(comments.values_list('post_id', 'post__author_id'))
+    if not rows:
+        return 0
+    with batched_comment_deletes():
+        deleted, _ = comments.delete()
+    received = Counter(author_id for _, author_id in rows)
+    for author_id, count in received.items():
+        stats.bump(author_id, comments_received=-count)
+    post_ids = {post_id for post_id, _ in rows}
+    Post.objects.filter(pk__in=post_ids).update(updated_at=tz.now())
+    versions.touch(versions.COMMENTS, *map(versions.post_scope, post_ids))
+    return deleted
+
+
+def post_rows(post_ids):
+    """Rows deleted along with the posts, by model."""
+    return {Comment: Comment.objects.filter(post_id__in=post_ids).count()}
+
+
+def user_rows(user_ids):
+    """Rows deleted along with the users, by model."""
+    return {
+        Post: Post.objects.filter(author_id__in=user_ids).count(),
+        Comment: Comment.objects.filter(
+            Q(author_id__in=user_ids) | Q(post__author_id__in=user_ids)
+        ).count(),
+    }
+
+
+def delete_post(post):
+    """Delete `post` now or defer it; return True when deferred."""
+    if sum(post_rows([post.pk]).values()) <= settings.DELETE_SYNC_LIMIT:
+        with transaction.atomic():
+            delete_comments(post.comments.all())
+            post.delete()
+        return False
+    with transaction.atomic():
+        PendingDeletion.objects.get_or_create(post=post)
+        hide_posts(Post.objects.filter(pk=post.pk))
+    return True
+
+
+def delete_user(user):
+    """Delete `user` now or defer it; return True when deferred."""
+    if sum(user_rows([user.pk]).values()) <= settings.DELETE_SYNC_LIMIT:
+        with transaction.atomic():
+            delete_comments(Comment.objects.filter(
+                Q(author=user) | Q(post__author=user)))
+            user.delete()
+        return False
+    with transaction.atomic():
+        PendingDeletion.objects.get_or_create(user=user)
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        hide_posts(user.posts.all())
+        # Their comments drop out of Comment.objects.alive(); saving the
+        # user touches USERS, which every page showing comments depends on.
+    users.forget(user.username)
+    return True
+
+
+@contextmanager
+def timed(stats):
+    """Time a write transaction: the span the write lock may be held."""
+    started = time.perf_counter()
+    with transaction.atomic():
+        yield
+    stats.append(time.perf_counter() - started)
+
+
+def delete_in_batches(comments, batch_size, lock_times):
+    """Delete the `comments` queryset one batch per transaction."""
+    while True:
+        ids = list(comments.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+        with timed(lock_times):
+            delete_comments(Comment.objects.filter(pk__in=ids))
+        yield len(ids)
+
+
+def reap_post(post_id, batch_size, lock_times):
+    comments = Comment.objects.filter(post_id=post_id)
+    yield from delete_in_batches(comments, batch_size, lock_times)
+    with timed(lock_times):
+        # A buffered comment may have been written since the last batch.
+        deleted = delete_comments(comments)
+        rows, _ = Post.objects.filter(pk=post_id).delete()
+    if deleted + rows:
+        yield deleted + rows
+
+
+def reap_user(user_id, batch_size, lock_times):
+    yield from delete_in_batches(Comment.objects.filter(author_id=user_id),
+                                 batch_size, lock_times)
+    for post_id in list(Post.objects.filter(author_id=user_id)
+                        .values_list('pk', flat=True)):
+        yield from reap_post(post_id, batch_size, lock_times)
+    with timed(lock_times):
+        rows, _ = User.objects.filter(pk=user_id).delete()
+    if rows:
+        yield rows
+
+
+def reap(batch_size=BATCH_SIZE, lock_times=None):
+    """
+    Delete everything with a tombstone, oldest first. Yields
+    (tombstone, rows deleted by the batch); `lock_times` collects the
+    duration of every write transaction.
+    """
+    lock_times = [] if lock_times is None else lock_times
+    for tombstone in PendingDeletion.objects.all():
+        if not PendingDeletion.objects.filter(pk=tombstone.pk).exists():
+            # Went with its target, e.g. a post of a user reaped before.
+            continue
+        if tombstone.post_id:
+            batches = reap_post(tombstone.post_id, batch_size, lock_times)
+        else:
+            batches = reap_user(tombstone.user_id, batch_size, lock_times)
+        for rows in batches:
+            yield tombstone, rows
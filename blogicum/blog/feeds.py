@@ -0,0 +1,112 @@
+"""
+RSS and Atom feeds of the main feed, categories and authors.
+Rendered feeds are cached under their change marks, so publishing a post
+invalidates them and polling readers get 304 until then.
+"""
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+
+from . import versions
+from .conditional import public_cache
+from .models import Category, Post
+from .users import get_profile
+
+FEED_LENGTH = 20
+
+cached_feed = public_cache(versions.POSTS, versions.CATEGORIES, versions.USERS)
+
+
+class PostsFeed(Feed):
+    title = 'Блогикум'
+    link = reverse_lazy('blog:index')
+    description = 'Новые публикации'
+
+    def posts(self, obj):
+        return Post.objects.published()
+
+    def items(self, obj=None):
+        return (
+            self.posts(obj)
+            .select_related('author', 'category')[:FEED_LENGTH]
+        )
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.text
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', kwargs={'post_id': post.id})
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_author_name(self, post):
+        return post.author.username
+
+    def item_author_link(self, post):
+        return reverse('blog:profile',
+                       kwargs={'username': post.author.username})
+
+    def item_categories(self, post):
+        return (post.category.title,) if post.category else ()
+
+
+class CategoryPostsFeed(PostsFeed):
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def link(self, category):
+        return reverse('blog:category_posts',
+                       kwargs={'category_slug': category.slug})
+
+    def description(self, category):
+        return category.description
+
+    def posts(self, category):
+        return super().posts(category).filter(category=category)
+
+
+class ProfilePostsFeed(PostsFeed):
+
+    def get_object(self, request, username):
+        return get_profile(username)
+
+    def title(self, author):
+        return f'Блогикум: @{author.username}'
+
+    def link(self, author):
+        return reverse('blog:profile', kwargs={'username': author.username})
+
+    def description(self, author):
+        return f'Публикации пользователя {author.username}'
+
+    def posts(self, author):
+        return super().posts(author).filter(author=author)
+
+
+class PostsAtomFeed(PostsFeed):
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = CategoryPostsFeed.description
+
+
+class ProfilePostsAtomFeed(ProfilePostsFeed):
+    feed_type = Atom1Feed
+    subtitle = ProfilePostsFeed.description
@@ -0,0 +1,34 @@
+"""
+Keyset pagination over (pub_date, id), newest first.
+A cursor is the position of the last row shown; the next page starts
+right after it, so deep pages cost as much as the first one.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.core.exceptions import BadRequest
+from django.db.models import Q
+
+
+def encode_cursor(pub_date, pk):
+    raw = json.dumps([pub_date.isoformat(), pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        pub_date, pk = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(pub_date), int(pk)
+    except (binascii.Error, ValueError, TypeError):
+        raise BadRequest('Invalid cursor')
+
+
+def after(queryset, cursor):
+    """Rows of a (-pub_date, -id) ordered queryset past `cursor`."""
+    if not cursor:
+        return queryset
+    pub_date, pk = decode_cursor(cursor)
+    return queryset.filter(Q(pub_date__lt=pub_date)
+                           | Q(pub_date=pub_date, id__lt=pk))
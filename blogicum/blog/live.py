@@ -0,0 +1,146 @@
+"""
+Live comments over Server-Sent Events.
+A new comment is rendered once and published to an in-process broker
+that keeps the last few events of every post and wakes up the streams
+waiting on it. A stream answers with whatever is new and ends, and the
+browser reconnects after RETRY_MS with Last-Event-ID; comments made in
+another worker process are caught up from the database on reconnect.
+Only the async stream waits for new events: the page opens a stream
+only with ASYNC_VIEWS on, and the sync view answers straight away.
+"""
+import asyncio
+import threading
+from collections import OrderedDict, deque
+
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+
+from .models import Comment, Post
+
+COMMENT_TEMPLATE = 'includes/comment.html'
+
+# Events kept per post and posts kept by the broker.
+HISTORY = 50
+CHANNELS = 1000
+
+# How long a stream waits for a new comment before it ends.
+STREAM_TIMEOUT = 25
+
+RETRY_MS = 1000
+
+
+class Broker:
+    """Fan-out of recent (id, data) events per channel."""
+
+    def __init__(self, history=HISTORY, channels=CHANNELS):
+        self._lock = threading.Lock()
+        self._history = history
+        self._channels = channels
+        self._events = OrderedDict()
+        self._waiters = {}
+
+    def publish(self, channel, event_id, data):
+        with self._lock:
+            events = self._events.pop(channel, None)
+            if events is None:
+                events = deque(maxlen=self._history)
+            events.append((event_id, data))
+            self._events[channel] = events
+            while len(self._events) > self._channels:
+                self._events.popitem(last=False)
+        self.notify(channel)
+
+    def notify(self, channel):
+        """Wake up the streams of `channel` without an event."""
+        with self._lock:
+            waiters = self._waiters.pop(channel, ())
+        for wake in waiters:
+            wake()
+
+    def _since(self, channel, after):
+        return [event for event in self._events.get(channel, ())
+                if event[0] > after]
+
+    def _subscribe(self, channel, after, wake):
+        with self._lock:
+            events = self._since(channel, after)
+            if not events:
+                self._waiters.setdefault(channel, set()).add(wake)
+            return events
+
+    def _unsubscribe(self, channel, after, wake):
+        with self._lock:
+            self._waiters.get(channel, set()).discard(wake)
+            return self._since(channel, after)
+
+    async def wait_async(self, channel, after, timeout):
+        """Return the events after `after`, waiting up to `timeout`."""
+        loop = asyncio.get_running_loop()
+        woken = asyncio.Event()
+
+        def wake():
+            loop.call_soon_threadsafe(woken.set)
+
+        events = self._subscribe(channel, after, wake)
+        if not events:
+            try:
+                await asyncio.wait_for(woken.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            events = self._unsubscribe(channel, after, wake)
+        return events
+
+
+broker = Broker()
+
+
+def render_comment(comment):
+    return render_to_string(COMMENT_TEMPLATE, {'comment': comment})
+
+
+def publish_comment(comment):
+    broker.publish(comment.post_id, comment.id, render_comment(comment))
+
+
+def last_event_id(request):
+    value = request.headers.get('Last-Event-ID', request.GET.get('after'))
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def catch_up(request, post_id, after):
+    """
+    Render the comments newer than `after` straight from the database.
+    Returns None when the post is not shown to the user.
+    """
+    post = (Post.objects.alive().filter(pk=post_id)
+            .values('visible', 'author_id').first())
+    if post is None or not (post['visible']
+                            or post['author_id'] == request.user.pk):
+        return None
+    comments = (
+        Comment.objects.alive().filter(post_id=post_id, id__gt=after)
+        .select_related('author')
+        .order_by('id')
+    )
+    return [(comment.id, render_comment(comment)) for comment in comments]
+
+
+def format_event(event_id, data):
+    lines = ''.join(f'data: {line}\n' for line in data.splitlines())
+    return f'id: {event_id}\nevent: comment\n{lines}\n'
+
+
+def event_response(events):
+    response = HttpResponse(
+        f'retry: {RETRY_MS}\n\n'
+        + ''.join(format_event(*event) for event in events)
+        + ('' if events else ': no new comments\n\n'),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Keep proxies from holding the stream back.
+    response['X-Accel-Buffering'] = 'no'
+    return response
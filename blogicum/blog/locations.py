@@ -0,0 +1,32 @@
+"""
+Location browsing.
+Post lists of a location walk the (location, pub_date) index with
+keyset cursors; the top locations summary is cached under the change
+marks of posts and locations.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from . import versions
+from .models import Location
+
+TOP_LOCATIONS = 10
+
+
+def top_locations(limit=TOP_LOCATIONS):
+    """Published locations with the most visible posts."""
+    key = 'blog:top_locations:{}:{}:{}'.format(
+        limit, *versions.marks(versions.POSTS, versions.LOCATIONS)
+    )
+    locations = cache.get(key)
+    if locations is None:
+        locations = list(
+            Location.objects.filter(is_published=True)
+            .annotate(post_count=Count('posts',
+                                       filter=Q(posts__visible=True)))
+            .filter(post_count__gt=0)
+            .order_by('-post_count', 'name')
+            .values('id', 'name', 'post_count')[:limit]
+        )
+        cache.set(key, locations)
+    return locations
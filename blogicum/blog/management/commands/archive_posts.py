@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.archive import BATCH_SIZE, archive_posts, horizon
+
+
+class Command(BaseCommand):
+    help = ('Moves visible posts older than the horizon, with their '
+            'comments, to the archive and rebuilds the archive months.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--horizon-days',
+            type=int,
+            default=settings.ARCHIVE_HORIZON_DAYS,
+            help='Posts published more than this many days ago are moved.',
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        before = horizon(days=options['horizon_days'])
+        touched = set()
+        for months in archive_posts(before, options['batch_size']):
+            touched |= months
+            self.stdout.write(
+                'Archived a batch from '
+                + ', '.join(f'{year}-{month:02}'
+                            for year, month in sorted(months))
+            )
+        self.stdout.write(
+            f'Archived posts published before {before:%Y-%m-%d}, '
+            f'{len(touched)} month(s) rebuilt.'
+        )
@@ -0,0 +1,83 @@
+import statistics
+import time
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from blog.admin import PostAdmin
+from blog.models import Post
+
+User = get_user_model()
+
+BENCH_USERNAME = 'bench_admin'
+
+
+class PlainPostAdmin(PostAdmin):
+    """PostAdmin without the changelist tuning."""
+
+    list_select_related = False
+    paginator = Paginator
+    show_full_result_count = True
+
+    def get_changelist_form(self, request, **kwargs):
+        return admin.ModelAdmin.get_changelist_form(self, request, **kwargs)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        return admin.ModelAdmin.formfield_for_foreignkey(
+            self, db_field, request, **kwargs)
+
+
+class Command(BaseCommand):
+    help = ('Renders the Post changelist of the admin with a plain '
+            'PostAdmin and with the tuned one and compares render time and '
+            'queries. Fill the database with generate_posts first.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--query',
+            default='',
+            help='Changelist query string, e.g. "category__id__exact=1".',
+        )
+
+    def handle(self, *args, **options):
+        user, created = User.objects.get_or_create(
+            username=BENCH_USERNAME,
+            defaults={'is_staff': True, 'is_superuser': True},
+        )
+        url = '/admin/blog/post/?' + options['query']
+        self.stdout.write(f'{Post.objects.count()} posts, GET {url}')
+        try:
+            for name, model_admin in (('plain', PlainPostAdmin),
+                                      ('tuned', PostAdmin)):
+                self.run(name, model_admin(Post, admin.site), user, url,
+                         options['repeat'])
+        finally:
+            if created:
+                user.delete()
+
+    def run(self, name, model_admin, user, url, repeat):
+        # The admin URLs are bound to the registered PostAdmin, so the
+        # view is called directly.
+        timings = []
+        for _ in range(repeat):
+            request = RequestFactory().get(url)
+            request.user = user
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = model_admin.changelist_view(request)
+                response.render()
+                timings.append(time.perf_counter() - started)
+        sql_time = sum(float(query['time'])
+                       for query in context.captured_queries)
+        self.stdout.write(
+            f'{name:<6} status {response.status_code}  '
+            f'median {statistics.median(timings) * 1000:8.1f} ms  '
+            f'{len(context.captured_queries):4} queries  '
+            f'{sql_time * 1000:8.1f} ms in SQL'
+        )
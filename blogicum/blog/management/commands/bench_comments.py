@@ -0,0 +1,75 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from blog.comment_buffer import CommentBuffer
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = ('Writes comments from concurrent threads one INSERT at a time '
+            'and through the comment buffer and compares throughput. '
+            'The comments are deleted afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=8,
+            help='Concurrent writer threads.',
+        )
+        parser.add_argument(
+            '--comments',
+            type=int,
+            default=50,
+            help='Comments written by each writer.',
+        )
+
+    def handle(self, *args, **options):
+        post = Post.objects.published().select_related('author').first()
+        if post is None:
+            raise CommandError('Needs at least one published post.')
+        start_id = Comment.objects.order_by('-id').values_list(
+            'id', flat=True).first() or 0
+
+        for mode in ('direct', 'buffered'):
+            buffer = CommentBuffer()
+            started = time.perf_counter()
+            errors = self.run_writers(post, buffer if mode == 'buffered'
+                                      else None, options)
+            if mode == 'buffered':
+                buffer.flush()
+            elapsed = time.perf_counter() - started
+            written = Comment.objects.filter(id__gt=start_id).count()
+            Comment.objects.filter(id__gt=start_id).delete()
+            self.stdout.write(
+                f'{mode:<8} {written:6} comments in {elapsed:6.2f} s  '
+                f'{written / elapsed:8.1f} comments/s  {errors} errors'
+            )
+
+    def run_writers(self, post, buffer, options):
+        errors = []
+
+        def write():
+            try:
+                for i in range(options['comments']):
+                    comment = Comment(post=post, author=post.author,
+                                      text=f'Benchmark comment {i}')
+                    if buffer is None:
+                        comment.save()
+                    else:
+                        buffer.add(comment)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                close_old_connections()
+
+        threads = [threading.Thread(target=write)
+                   for _ in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return len(errors)
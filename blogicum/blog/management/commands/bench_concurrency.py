@@ -0,0 +1,106 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+
+from blog import connections
+
+DEFAULT_URLS = ('/', '/feeds/rss/')
+
+
+class Command(BaseCommand):
+    help = ('Sends the same burst of concurrent requests through the WSGI '
+            'and the ASGI handler and compares throughput and latency. '
+            'WSGI concurrency is capped by --threads; ASGI serves every '
+            'request of the burst at once.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*', default=DEFAULT_URLS)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Requests sent to each URL in each mode.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=50,
+            help='Requests in flight at the same time.',
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=8,
+            help='Worker threads of the simulated WSGI server.',
+        )
+
+    # Test clients send Host: testserver.
+    @override_settings(ALLOWED_HOSTS=['testserver'])
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'ASYNC_VIEWS={settings.ASYNC_VIEWS}, '
+            f'{options["requests"]} requests per URL, '
+            f'concurrency {options["concurrency"]}, '
+            f'{options["threads"]} WSGI threads'
+        )
+        for url in options['urls']:
+            for mode, run in (('wsgi', self.run_wsgi),
+                              ('asgi', self.run_asgi)):
+                before = connections.stats.snapshot()
+                started = time.perf_counter()
+                latencies = run(url, options)
+                elapsed = time.perf_counter() - started
+                self.report(url, mode, latencies, elapsed)
+                after = connections.stats.snapshot()
+                self.stdout.write(
+                    f'{"":<24} {mode}  '
+                    f'{(after["opened"] - before["opened"]) / elapsed:8.1f} '
+                    f'connection opens/s  '
+                    f'{(after["reused"] - before["reused"]) / elapsed:8.1f} '
+                    f'reuses/s'
+                )
+
+    def run_wsgi(self, url, options):
+        local = threading.local()
+
+        def get(_):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            started = time.perf_counter()
+            local.client.get(url)
+            return time.perf_counter() - started
+
+        workers = min(options['threads'], options['concurrency'])
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(get, range(options['requests'])))
+
+    def run_asgi(self, url, options):
+        async def burst():
+            client = AsyncClient()
+            slots = asyncio.Semaphore(options['concurrency'])
+
+            async def get():
+                async with slots:
+                    started = time.perf_counter()
+                    await client.get(url)
+                    return time.perf_counter() - started
+
+            return await asyncio.gather(
+                *(get() for _ in range(options['requests']))
+            )
+        return asyncio.run(burst())
+
+    def report(self, url, mode, latencies, elapsed):
+        latencies = sorted(latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f'{url:<24} {mode}  {len(latencies) / elapsed:8.1f} req/s  '
+            f'p50 {statistics.median(latencies) * 1000:8.1f} ms  '
+            f'p95 {p95 * 1000:8.1f} ms'
+        )
@@ -0,0 +1,108 @@
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.db.models import Count
+from django.test.utils import override_settings
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = ('Runs concurrent readers (index page query) and writers (new '
+            'comments) against the database, first with SQLite defaults '
+            'and then with SQLITE_PRAGMAS, and compares throughput. Fill '
+            'the database with generate_posts and run with the production '
+            'settings; the comments written are deleted afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Only makes sense on SQLite.')
+        if not settings.SQLITE_PRAGMAS:
+            raise CommandError(
+                'SQLITE_PRAGMAS is empty, run with '
+                'DJANGO_SETTINGS_MODULE=blogicum.settings_production.'
+            )
+        post_ids = list(
+            Post.objects.published().values_list('pk', flat=True)[:1000]
+        )
+        if not post_ids:
+            raise CommandError('No published posts, run generate_posts.')
+        author_id = Post.objects.values_list('author_id', flat=True).first()
+
+        for profile, pragmas in (
+            ('defaults', {'journal_mode': 'delete'}),
+            ('tuned', settings.SQLITE_PRAGMAS),
+        ):
+            # journal_mode is stored in the file and only changes while
+            # no other connection is open; pooled ones count too.
+            connection.close()
+            if hasattr(connection, 'clear_pool'):
+                connection.clear_pool()
+            with override_settings(SQLITE_PRAGMAS=pragmas):
+                connection.ensure_connection()
+                start_id = Comment.objects.order_by('-id').values_list(
+                    'id', flat=True).first() or 0
+                stats = self.run(post_ids, author_id, options)
+            Comment.objects.filter(id__gt=start_id).delete()
+            self.stdout.write(
+                f'{profile:<8}  '
+                f'{stats["reads"] / options["seconds"]:8.1f} reads/s  '
+                f'{stats["writes"] / options["seconds"]:8.1f} writes/s  '
+                f'{stats["locked"]} "database is locked"'
+            )
+
+    @staticmethod
+    def read(post_ids, author_id):
+        list(
+            Post.objects.published()
+            .select_related('location', 'author', 'category')
+            .annotate(comment_count=Count('comments'))
+            .order_by('-pub_date')[:10]
+        )
+
+    @staticmethod
+    def write(post_ids, author_id):
+        Comment.objects.create(post_id=random.choice(post_ids),
+                               author_id=author_id,
+                               text='Benchmark comment')
+
+    def run(self, post_ids, author_id, options):
+        stats = {'reads': 0, 'writes': 0, 'locked': 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['seconds']
+
+        def loop(action, key):
+            done = locked = 0
+            try:
+                while time.monotonic() < deadline:
+                    try:
+                        action(post_ids, author_id)
+                        done += 1
+                    except OperationalError:
+                        locked += 1
+            finally:
+                connection.close()
+            with lock:
+                stats[key] += done
+                stats['locked'] += locked
+
+        threads = (
+            [threading.Thread(target=loop, args=(self.read, 'reads'))
+             for _ in range(options['readers'])]
+            + [threading.Thread(target=loop, args=(self.write, 'writes'))
+               for _ in range(options['writers'])]
+        )
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats
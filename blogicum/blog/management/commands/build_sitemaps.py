@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from blog import sitemaps
+
+MANIFEST = 'manifest.json'
+
+
+class Command(BaseCommand):
+    help = ('Writes the sitemap index, section sitemaps and post chunks to '
+            'SITEMAP_ROOT. Post chunks are only rebuilt when their posts '
+            'changed since the previous run.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--domain', required=True,
+                            help='Host name used in sitemap URLs.')
+        parser.add_argument('--protocol', default='https')
+        parser.add_argument('--full', action='store_true',
+                            help='Rebuild every chunk.')
+
+    def handle(self, *args, domain, protocol, full, **options):
+        root = Path(settings.SITEMAP_ROOT)
+        root.mkdir(parents=True, exist_ok=True)
+        manifest_path = root / MANIFEST
+        manifest = {}
+        if manifest_path.exists() and not full:
+            manifest = json.loads(manifest_path.read_text())
+
+        stats = sitemaps.chunk_stats()
+        state = {
+            str(chunk): [count, last_updated.isoformat()]
+            for chunk, (count, last_updated) in stats.items()
+        }
+
+        rebuilt = 0
+        for chunk in stats:
+            path = self.file_for(root, sitemaps.chunk_path(chunk))
+            if manifest.get(str(chunk)) == state[str(chunk)] and path.exists():
+                continue
+            path.write_text(sitemaps.render_urlset(
+                sitemaps.PostChunkSitemap(chunk), domain, protocol))
+            rebuilt += 1
+
+        for chunk in manifest.keys() - state.keys():
+            self.file_for(root, sitemaps.chunk_path(int(chunk))).unlink(
+                missing_ok=True)
+
+        for section, page in sitemaps.section_pages():
+            path = self.file_for(root, sitemaps.section_path(section, page))
+            path.write_text(sitemaps.render_urlset(
+                sitemaps.SECTIONS[section](), domain, protocol, page))
+
+        path = self.file_for(root, reverse('blog:sitemap'))
+        path.write_text(sitemaps.render_index(domain, protocol, stats))
+        manifest_path.write_text(json.dumps(state))
+
+        self.stdout.write(
+            f'{len(stats)} post chunks, {rebuilt} rebuilt, '
+            f'{len(manifest.keys() - state.keys())} removed.'
+        )
+
+    @staticmethod
+    def file_for(root, url_path):
+        return root / url_path.rsplit('/', 1)[-1]
@@ -0,0 +1,115 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone as tz
+
+from blog import sidebar, stats, versions
+from blog.models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+WORDS = (
+    'блог пост город море горы лес река утро вечер дорога поезд кофе '
+    'книга музыка кино друзья погода осень весна лето зима путешествие '
+    'работа дом сад кухня рецепт фото прогулка выходные праздник'
+).split()
+
+BATCH_SIZE = 1000
+
+
+def sentence(rnd, words):
+    return ' '.join(rnd.choices(WORDS, k=words)).capitalize() + '.'
+
+
+class Command(BaseCommand):
+    help = ('Fills the database with random users, categories, locations, '
+            'posts and comments for load tests and benchmarks.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=30)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument(
+            '--comments',
+            type=int,
+            default=5,
+            help='Average number of comments per post.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        now = tz.now()
+        prefix = f'gen{options["seed"]}_{int(now.timestamp())}'
+
+        users = User.objects.bulk_create(
+            User(username=f'{prefix}_{i}')
+            for i in range(options['users'])
+        )
+        categories = Category.objects.bulk_create(
+            Category(title=sentence(rnd, 2)[:-1],
+                     description=sentence(rnd, 8),
+                     slug=f'{prefix}_{i}',
+                     is_published=rnd.random() > 0.1)
+            for i in range(options['categories'])
+        )
+        locations = Location.objects.bulk_create(
+            Location(name=sentence(rnd, 2)[:-1],
+                     is_published=rnd.random() > 0.1)
+            for _ in range(options['locations'])
+        )
+        # SQLite hands out no ids on bulk_create.
+        users = list(User.objects.filter(username__startswith=prefix))
+        categories = list(Category.objects.filter(slug__startswith=prefix))
+        locations = list(Location.objects.filter(
+            pk__in=Location.objects.order_by('-pk')
+            .values('pk')[:len(locations)]
+        ))
+
+        posts = []
+        for _ in range(options['posts']):
+            category = rnd.choice(categories)
+            # Up to three years back; a few are scheduled for tomorrow.
+            minutes = rnd.randint(-60 * 24, 60 * 24 * 365 * 3)
+            pub_date = now - timedelta(minutes=minutes)
+            is_published = rnd.random() > 0.05
+            posts.append(Post(
+                title=sentence(rnd, 4)[:-1],
+                text=' '.join(sentence(rnd, 12) for _ in range(4)),
+                pub_date=pub_date,
+                author=rnd.choice(users),
+                category=category,
+                location=rnd.choice(locations + [None]),
+                is_published=is_published,
+                # bulk_create skips Post.save().
+                visible=(is_published and pub_date <= now
+                         and category.is_published),
+            ))
+        Post.objects.bulk_create(posts, batch_size=BATCH_SIZE)
+        post_ids = list(
+            Post.objects.order_by('-pk').values_list('pk', flat=True)
+            [:len(posts)]
+        )
+
+        comments = [
+            Comment(post_id=rnd.choice(post_ids), author=rnd.choice(users),
+                    text=sentence(rnd, 10))
+            for _ in range(len(post_ids) * options['comments'])
+        ]
+        Comment.objects.bulk_create(comments, batch_size=BATCH_SIZE)
+
+        # bulk_create sends no post_save to keep the counts and stats.
+        sidebar.refresh_counts(category.pk for category in categories)
+        stats.recount(user.pk for user in users)
+        versions.touch(versions.POSTS, versions.CATEGORIES,
+                       versions.LOCATIONS, versions.USERS)
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(users)} users, {len(categories)} categories, '
+            f'{len(locations)} locations, {len(posts)} posts and '
+            f'{len(comments)} comments.'
+        ))
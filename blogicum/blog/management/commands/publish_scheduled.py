@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone as tz
+
+from blog.scheduler import next_publication_at, publish_due_posts
+
+
+class Command(BaseCommand):
+    help = ('Publishes posts whose pub_date has come. '
+            'With --loop keeps running and wakes up at the next pub_date.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Run as a long-living worker.',
+        )
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=60,
+            help='Upper bound in seconds between two checks in --loop mode; '
+                 'catches posts scheduled while the worker sleeps.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            post_ids = publish_due_posts()
+            if post_ids:
+                self.stdout.write(
+                    f'Published {len(post_ids)} post(s): '
+                    f'{", ".join(map(str, post_ids))}'
+                )
+            if not options['loop']:
+                return
+            time.sleep(self.get_delay(options['max_sleep']))
+
+    @staticmethod
+    def get_delay(max_sleep):
+        next_at = next_publication_at()
+        if next_at is None:
+            return max_sleep
+        delay = (next_at - tz.now()).total_seconds()
+        return min(max(delay, 0), max_sleep)
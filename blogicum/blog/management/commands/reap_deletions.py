@@ -0,0 +1,56 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.deletion import BATCH_SIZE, reap
+
+
+class Command(BaseCommand):
+    help = ('Deletes the posts and users hidden by a deferred deletion, '
+            'their comments first, in batches of short transactions, and '
+            'reports how long each batch held the write lock.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.05,
+            help='Seconds between batches, left to the other writers.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Run as a long-living worker.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60,
+            help='Seconds between two checks in --loop mode.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.reap(options)
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
+
+    def reap(self, options):
+        lock_times = []
+        rows = 0
+        for tombstone, deleted in reap(options['batch_size'], lock_times):
+            rows += deleted
+            self.stdout.write(
+                f'{tombstone}: {deleted} row(s) deleted, lock held '
+                f'{lock_times[-1] * 1000:.1f} ms'
+            )
+            time.sleep(options['pause'])
+        if lock_times:
+            self.stdout.write(
+                f'Deleted {rows} row(s) in {len(lock_times)} batch(es), '
+                f'lock held max {max(lock_times) * 1000:.1f} ms, '
+                f'mean {statistics.mean(lock_times) * 1000:.1f} ms.'
+            )
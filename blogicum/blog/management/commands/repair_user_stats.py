@@ -0,0 +1,24 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from blog.stats import recount
+
+User = get_user_model()
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = ('Recounts the profile statistics of every user, fixing '
+            'counters that drifted from the posts and comments.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        user_ids = list(User.objects.order_by('pk')
+                        .values_list('pk', flat=True))
+        size = options['batch_size']
+        for start in range(0, len(user_ids), size):
+            recount(user_ids[start:start + size])
+        self.stdout.write(f'Recounted the stats of {len(user_ids)} user(s).')
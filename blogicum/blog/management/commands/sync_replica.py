@@ -0,0 +1,57 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from blogicum.routers import REPLICA
+
+
+class Command(BaseCommand):
+    help = ('Copies the primary SQLite database into the replica with the '
+            'SQLite online backup API. With --loop keeps copying every '
+            '--interval seconds.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Run as a long-living worker.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds between two copies in --loop mode; the most the '
+                 'replica lags behind.',
+        )
+
+    def handle(self, *args, **options):
+        if REPLICA not in connections.databases:
+            raise CommandError(
+                'No replica configured, set DJANGO_DB_REPLICA to its path.'
+            )
+        primary = connections['default']
+        if primary.vendor != 'sqlite':
+            raise CommandError('Only SQLite databases can be copied.')
+        while True:
+            started = time.perf_counter()
+            self.copy(primary, connections.databases[REPLICA]['NAME'])
+            self.stdout.write(
+                f'Replica synced in '
+                f'{(time.perf_counter() - started) * 1000:.1f} ms'
+            )
+            if not options['loop']:
+                return
+            primary.close()
+            time.sleep(options['interval'])
+
+    @staticmethod
+    def copy(primary, replica_name):
+        primary.ensure_connection()
+        target = sqlite3.connect(str(replica_name))
+        try:
+            # One step: readers of the replica never see a half copy.
+            primary.connection.backup(target)
+        finally:
+            target.close()
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def fill_visible(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(
+        is_published=True, pub_date__lte=timezone.now()
+    ).update(visible=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_image'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='comment',
+            options={'ordering': ('created_at',), 'verbose_name': 'Комментарий', 'verbose_name_plural': 'Комментарии'},
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='visible',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Виден читателям'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='blog.post', verbose_name='Публикация'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['visible', 'pub_date'], name='post_visible_pub_date_idx'),
+        ),
+        migrations.RunPython(fill_visible, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:12
+
+from django.db import migrations
+
+
+def hide_posts_of_unpublished_categories(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(visible=True).exclude(
+        category__is_published=True
+    ).update(visible=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_visible'),
+    ]
+
+    operations = [
+        migrations.RunPython(hide_posts_of_unpublished_categories,
+                             migrations.RunPython.noop),
+    ]
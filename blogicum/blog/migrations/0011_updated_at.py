@@ -0,0 +1,36 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:36
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_updated_at(apps, schema_editor):
+    for model_name in ('Category', 'Location', 'Post'):
+        model = apps.get_model('blog', model_name)
+        model.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_visible_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Изменено'),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:55
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0011_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPost',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок поста')),
+                ('text', models.TextField(verbose_name='Текст')),
+                ('pub_date', models.DateTimeField(db_index=True, verbose_name='Дата и время публикации')),
+                ('image', models.ImageField(blank=True, upload_to='posts_images', verbose_name='Изображение')),
+                ('created_at', models.DateTimeField(verbose_name='Добавлено')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='В архиве с')),
+                ('comments', models.JSONField(default=list, verbose_name='Комментарии')),
+            ],
+            options={
+                'verbose_name': 'архивная публикация',
+                'verbose_name_plural': 'Архив публикаций',
+                'ordering': ('-pub_date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchiveMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Год')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Месяц')),
+                ('posts', models.JSONField(default=list, verbose_name='Публикации')),
+            ],
+            options={
+                'verbose_name': 'месяц архива',
+                'verbose_name_plural': 'Месяцы архива',
+                'ordering': ('-year', '-month'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='archivemonth',
+            constraint=models.UniqueConstraint(fields=('year', 'month'), name='archive_month_unique'),
+        ),
+        migrations.AddField(
+            model_name='archivedpost',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_posts', to=settings.AUTH_USER_MODEL, verbose_name='Автор публикации'),
+        ),
+        migrations.AddField(
+            model_name='archivedpost',
+            name='category',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_posts', to='blog.category', verbose_name='Категория'),
+        ),
+        migrations.AddField(
+            model_name='archivedpost',
+            name='location',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_posts', to='blog.location', verbose_name='Местоположение'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:59
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def fill_counts(apps, schema_editor):
+    Category = apps.get_model('blog', 'Category')
+    CategoryCount = apps.get_model('blog', 'CategoryCount')
+    CategoryCount.objects.bulk_create(
+        CategoryCount(category_id=pk, posts=posts)
+        for pk, posts in Category.objects.annotate(
+            visible_posts=Count('posts', filter=Q(posts__visible=True))
+        ).values_list('pk', 'visible_posts')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryCount',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='post_count', serialize=False, to='blog.category', verbose_name='Категория')),
+                ('posts', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+            ],
+            options={
+                'verbose_name': 'число публикаций в категории',
+                'verbose_name_plural': 'Числа публикаций в категориях',
+            },
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
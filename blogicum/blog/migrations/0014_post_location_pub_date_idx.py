@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_category_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['location', 'pub_date'], name='post_location_pub_date_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:03
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+import django.db.models.deletion
+
+
+def fill_stats(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    Comment = apps.get_model('blog', 'Comment')
+    UserStats = apps.get_model('blog', 'UserStats')
+    received = dict(
+        Comment.objects.values_list('post__author')
+        .annotate(total=Count('pk'))
+    )
+    commented = dict(
+        Comment.objects.values_list('author').annotate(last=Max('created_at'))
+    )
+    users = User.objects.annotate(
+        post_total=Count('posts'),
+        published_total=Count('posts', filter=Q(posts__visible=True)),
+        last_post=Max('posts__updated_at'),
+    ).values_list('pk', 'post_total', 'published_total', 'last_post')
+    UserStats.objects.bulk_create(
+        UserStats(
+            user_id=pk, posts=posts, published_posts=published,
+            comments_received=received.get(pk, 0),
+            last_activity=max(filter(None, (last_post, commented.get(pk))),
+                              default=None),
+        )
+        for pk, posts, published, last_post in users
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0014_post_location_pub_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='auth.user', verbose_name='Пользователь')),
+                ('posts', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+                ('published_posts', models.PositiveIntegerField(default=0, verbose_name='Опубликовано')),
+                ('comments_received', models.PositiveIntegerField(default=0, verbose_name='Комментариев к публикациям')),
+                ('last_activity', models.DateTimeField(null=True, verbose_name='Последняя активность')),
+            ],
+            options={
+                'verbose_name': 'статистика пользователя',
+                'verbose_name_plural': 'Статистика пользователей',
+            },
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0015_user_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('requested_at', models.DateTimeField(auto_now_add=True, verbose_name='Запрошено')),
+                ('post', models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pending_deletion', to='blog.post', verbose_name='Публикация')),
+                ('user', models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pending_deletion', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'отложенное удаление',
+                'verbose_name_plural': 'Отложенные удаления',
+                'ordering': ('requested_at',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='pendingdeletion',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('post__isnull', True), ('user__isnull', False)), models.Q(('post__isnull', False), ('user__isnull', True)), _connector='OR'), name='pending_deletion_one_target'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_pending_deletion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['pub_date', 'id'], name='post_pub_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:33
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_comment_counts(apps, schema_editor):
+    ArchivedPost = apps.get_model('blog', 'ArchivedPost')
+    UserStats = apps.get_model('blog', 'UserStats')
+    totals = {}
+    for post in ArchivedPost.objects.only('pk', 'author_id', 'comments'):
+        post.comment_count = len(post.comments)
+        post.save(update_fields=['comment_count'])
+        posts, comments = totals.get(post.author_id, (0, 0))
+        totals[post.author_id] = posts + 1, comments + post.comment_count
+    # Archived posts were taken off the profile totals when they left Post.
+    for author_id, (posts, comments) in totals.items():
+        UserStats.objects.filter(user_id=author_id).update(
+            posts=F('posts') + posts,
+            published_posts=F('published_posts') + posts,
+            comments_received=F('comments_received') + comments,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_post_pub_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedpost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Комментариев'),
+        ),
+        migrations.RunPython(fill_comment_counts, migrations.RunPython.noop),
+    ]
@@ -37,7 +37,8 @@ class CommentMixin:
 class DispatchMixin:
 
     def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(Post, pk=kwargs['post_id'])
+        instance = get_object_or_404(Post.objects.alive(),
+                                     pk=kwargs['post_id'])
         if instance.author != request.user:
             return redirect('blog:post_detail', self.kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
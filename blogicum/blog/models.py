@@ -4,16 +4,44 @@ It contains 4 models: User, Catalog, Location, Post
 """
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Case, Count, Max, Value, When
+from django.utils import timezone as tz
+
+from .signals import posts_visibility_changed
 
 User = get_user_model()
 
 MAX_LENGTH = 256
 
 
+class UpdatedQuerySet(models.QuerySet):
+    # Fields whose maximum tells when the rows last changed.
+    updated_fields = ('updated_at',)
+
+    def change_stats(self):
+        """
+        Row count and latest change of the (possibly sliced) queryset,
+        in a single aggregate query.
+        """
+        stats = self.aggregate(
+            count=Count('pk'),
+            **{f'last_{i}': Max(field)
+               for i, field in enumerate(self.updated_fields)}
+        )
+        count = stats.pop('count')
+        return {
+            'count': count,
+            'last_updated': max(filter(None, stats.values()), default=None),
+        }
+
+    def last_updated(self):
+        return self.change_stats()['last_updated']
+
+
 class PublishedModel(models.Model):
     """
     Abstract model class that added
-    is_published, created_at fields
+    is_published, created_at, updated_at fields
     """
 
     is_published = models.BooleanField(
@@ -26,9 +54,33 @@ class PublishedModel(models.Model):
                                       auto_now_add=True,
                                       )
 
+    updated_at = models.DateTimeField('Изменено',
+                                      auto_now=True,
+                                      db_index=True)
+
+    objects = UpdatedQuerySet.as_manager()
+
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'is_published' in field_names:
+            instance._saved_is_published = instance.is_published
+        return instance
+
+    def save(self, *args, **kwargs):
+        toggled = self.is_published != getattr(
+            self, '_saved_is_published', self.is_published)
+        super().save(*args, **kwargs)
+        self._saved_is_published = self.is_published
+        if toggled:
+            self.publication_toggled()
+
+    def publication_toggled(self):
+        """Called after a saved object has changed is_published."""
+
 
 class Category(PublishedModel):
     title = models.CharField('Заголовок',
@@ -50,6 +102,14 @@ class Category(PublishedModel):
     def __str__(self):
         return self.title
 
+    def publication_toggled(self):
+        posts = Post.objects.filter(category=self)
+        if self.is_published:
+            posts.refresh_visibility()
+        else:
+            posts.update(visible=False, updated_at=tz.now())
+        posts_visibility_changed.send(sender=Category, category=self)
+
 
 class Location(PublishedModel):
     name = models.CharField('Название места',
@@ -63,6 +123,56 @@ class Location(PublishedModel):
     def __str__(self):
         return self.name
 
+    def publication_toggled(self):
+        # Location does not affect post visibility, only the place name
+        # shown on the post card, so cached pages just have to go.
+        posts_visibility_changed.send(sender=Location, location=self)
+
+
+class PostQuerySet(UpdatedQuerySet):
+    # What a post card shows also depends on its category and location.
+    updated_fields = (
+        'updated_at',
+        'category__updated_at',
+        'location__updated_at',
+    )
+
+    def published(self):
+        """Posts that are visible to every reader."""
+        return self.filter(visible=True)
+
+    def alive(self):
+        """Posts not waiting for a deferred deletion."""
+        return self.filter(pending_deletion__isnull=True)
+
+    def due(self, now=None):
+        """Published posts whose scheduled pub_date has come."""
+        return self.filter(is_published=True,
+                           category__is_published=True,
+                           visible=False,
+                           pub_date__lte=now or tz.now())
+
+    def scheduled(self, now=None):
+        """Published posts waiting for their pub_date."""
+        return self.filter(is_published=True,
+                           category__is_published=True,
+                           visible=False,
+                           pub_date__gt=now or tz.now())
+
+    def refresh_visibility(self, now=None):
+        """
+        Recompute the visible flag with a single UPDATE.
+        Expects posts of published categories only.
+        """
+        now = now or tz.now()
+        return self.update(
+            visible=Case(
+                When(is_published=True, pub_date__lte=now, then=Value(True)),
+                default=Value(False),
+            ),
+            updated_at=now,
+        )
+
 
 class Post(PublishedModel):
     title = models.CharField('Заголовок поста',
@@ -94,15 +204,58 @@ class Post(PublishedModel):
                                  null=True,
                                  related_name='posts',
                                  verbose_name='Категория')
+    visible = models.BooleanField('Виден читателям',
+                                  default=False,
+                                  editable=False)
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date', )
+        indexes = (
+            models.Index(fields=('visible', 'pub_date'),
+                         name='post_visible_pub_date_idx'),
+            models.Index(fields=('location', 'pub_date'),
+                         name='post_location_pub_date_idx'),
+            models.Index(fields=('pub_date', 'id'),
+                         name='post_pub_date_id_idx'),
+        )
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'category_id' in field_names:
+            instance._saved_category_id = instance.category_id
+        if 'visible' in field_names:
+            instance._saved_visible = instance.visible
+        if 'author_id' in field_names:
+            instance._saved_author_id = instance.author_id
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.visible = (
+            self.is_published
+            and self.pub_date <= tz.now()
+            and Category.objects.filter(pk=self.category_id,
+                                        is_published=True).exists()
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'visible'}
+        super().save(*args, **kwargs)
+
+
+class CommentQuerySet(models.QuerySet):
+
+    def alive(self):
+        """Comments whose author is not waiting for a deferred deletion."""
+        return self.filter(author__pending_deletion__isnull=True)
+
 
 class Comment(models.Model):
     text = models.TextField('Текст комментария')
@@ -123,6 +276,8 @@ class Comment(models.Model):
         related_name='comments'
     )
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
@@ -130,3 +285,140 @@ class Comment(models.Model):
 
     def __str__(self):
         return self.text
+
+
+class ArchivedPost(models.Model):
+    """
+    A visible post older than ARCHIVE_HORIZON_DAYS, moved out of Post by
+    `manage.py archive_posts` with its comments frozen into `comments`.
+    Keeps the post id, so /posts/<id>/ still resolves.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField('Заголовок поста', max_length=MAX_LENGTH)
+    text = models.TextField('Текст')
+    pub_date = models.DateTimeField('Дата и время публикации', db_index=True)
+    image = models.ImageField('Изображение', upload_to='posts_images',
+                              blank=True)
+    author = models.ForeignKey(User,
+                               on_delete=models.CASCADE,
+                               verbose_name='Автор публикации',
+                               related_name='archived_posts')
+    location = models.ForeignKey(Location,
+                                 on_delete=models.SET_NULL,
+                                 null=True,
+                                 related_name='archived_posts',
+                                 verbose_name='Местоположение')
+    category = models.ForeignKey(Category,
+                                 on_delete=models.SET_NULL,
+                                 null=True,
+                                 related_name='archived_posts',
+                                 verbose_name='Категория')
+    created_at = models.DateTimeField('Добавлено')
+    archived_at = models.DateTimeField('В архиве с', auto_now_add=True)
+    comments = models.JSONField('Комментарии', default=list)
+    comment_count = models.PositiveIntegerField('Комментариев', default=0)
+
+    class Meta:
+        verbose_name = 'архивная публикация'
+        verbose_name_plural = 'Архив публикаций'
+        ordering = ('-pub_date', )
+
+    def __str__(self):
+        return self.title
+
+
+class ArchiveMonth(models.Model):
+    """Precomputed list of the archived posts of one month."""
+
+    year = models.PositiveSmallIntegerField('Год')
+    month = models.PositiveSmallIntegerField('Месяц')
+    posts = models.JSONField('Публикации', default=list)
+
+    class Meta:
+        verbose_name = 'месяц архива'
+        verbose_name_plural = 'Месяцы архива'
+        ordering = ('-year', '-month')
+        constraints = (
+            models.UniqueConstraint(fields=('year', 'month'),
+                                    name='archive_month_unique'),
+        )
+
+    def __str__(self):
+        return f'{self.month:02}.{self.year}'
+
+
+class CategoryCount(models.Model):
+    """Number of visible posts in a category, kept by blog.sidebar."""
+
+    category = models.OneToOneField(Category,
+                                    on_delete=models.CASCADE,
+                                    primary_key=True,
+                                    related_name='post_count',
+                                    verbose_name='Категория')
+    posts = models.PositiveIntegerField('Публикаций', default=0)
+
+    class Meta:
+        verbose_name = 'число публикаций в категории'
+        verbose_name_plural = 'Числа публикаций в категориях'
+
+    def __str__(self):
+        return f'{self.category_id}: {self.posts}'
+
+
+class UserStats(models.Model):
+    """Totals shown on a profile, kept by blog.stats."""
+
+    user = models.OneToOneField(User,
+                                on_delete=models.CASCADE,
+                                primary_key=True,
+                                related_name='stats',
+                                verbose_name='Пользователь')
+    posts = models.PositiveIntegerField('Публикаций', default=0)
+    published_posts = models.PositiveIntegerField('Опубликовано',
+                                                  default=0)
+    comments_received = models.PositiveIntegerField(
+        'Комментариев к публикациям', default=0)
+    last_activity = models.DateTimeField('Последняя активность', null=True)
+
+    class Meta:
+        verbose_name = 'статистика пользователя'
+        verbose_name_plural = 'Статистика пользователей'
+
+    def __str__(self):
+        return str(self.user_id)
+
+
+class PendingDeletion(models.Model):
+    """
+    Tombstone of a post or a user hidden at once and deleted later in
+    batches by `manage.py reap_deletions`.
+    """
+
+    post = models.OneToOneField(Post,
+                                on_delete=models.CASCADE,
+                                null=True,
+                                related_name='pending_deletion',
+                                verbose_name='Публикация')
+    user = models.OneToOneField(User,
+                                on_delete=models.CASCADE,
+                                null=True,
+                                related_name='pending_deletion',
+                                verbose_name='Пользователь')
+    requested_at = models.DateTimeField('Запрошено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'отложенное удаление'
+        verbose_name_plural = 'Отложенные удаления'
+        ordering = ('requested_at', )
+        constraints = (
+            models.CheckConstraint(
+                check=(models.Q(post__isnull=True, user__isnull=False)
+                       | models.Q(post__isnull=False, user__isnull=True)),
+                name='pending_deletion_one_target',
+            ),
+        )
+
+    def __str__(self):
+        return f'post {self.post_id}' if self.post_id else (
+            f'user {self.user_id}')
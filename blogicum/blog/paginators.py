@@ -0,0 +1,61 @@
+"""
+Paginator for very large tables.
+An exact COUNT(*) scans the whole table. For an unfiltered list the
+database's own row estimate is used instead once it passes
+ESTIMATED_COUNT_THRESHOLD; filtered lists are still counted exactly.
+The estimate may run past the real end of the list: the admin shows it
+as "~N", and a page found empty past the end falls back to the exact
+count and to the real last page.
+"""
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimated_count(model, using='default'):
+    """Approximate number of rows of `model`'s table, or None."""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [table],
+            )
+        elif connection.vendor == 'sqlite':
+            # The rowid only grows, so MAX() is an index seek and an
+            # upper bound of the row count.
+            cursor.execute(
+                f'SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}'
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row and row[0] and row[0] > 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    # Whether `count` is the database's estimate.
+    estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if hasattr(queryset, 'query') and not queryset.query.where:
+            estimate = estimated_count(queryset.model, queryset.db)
+            if (estimate is not None
+                    and estimate > settings.ESTIMATED_COUNT_THRESHOLD):
+                self.estimated = True
+                return estimate
+        return super().count
+
+    def page(self, number):
+        page = super().page(number)
+        # Evaluating the slice caches its rows for the caller.
+        if not self.estimated or page.number == 1 or page.object_list:
+            return page
+        self.estimated = False
+        self.__dict__['count'] = Paginator.count.func(self)
+        self.__dict__.pop('num_pages', None)
+        return super().page(min(page.number, self.num_pages))
@@ -0,0 +1,36 @@
+"""
+Fixed-window rate limits kept in the cache.
+Shared by every worker when the cache is (FileBasedCache in production);
+increments are not atomic across processes, which only lets a few extra
+hits through at the edge of a window.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def _key(scope, ident, bucket):
+    return f'blog:rate:{scope}:{ident}:{bucket}'
+
+
+def retry_after(scope, ident, limit, window):
+    """
+    Return the seconds to wait when `ident` has used up its `limit` hits
+    per `window` seconds, or 0 when one more hit is allowed.
+    """
+    now = time.time()
+    bucket = int(now // window)
+    if cache.get(_key(scope, ident, bucket), 0) < limit:
+        return 0
+    return int((bucket + 1) * window - now) + 1
+
+
+def hit(scope, ident, window):
+    """Count a hit of `ident` in the current window."""
+    key = _key(scope, ident, int(time.time() // window))
+    cache.add(key, 0, window)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Expired between add() and incr().
+        cache.set(key, 1, window)
@@ -0,0 +1,30 @@
+"""
+Deferred publication.
+Flips Post.visible once a post's pub_date has come.
+"""
+from django.db.models import Min
+from django.utils import timezone as tz
+
+from .models import Post
+from .signals import posts_visibility_changed
+
+
+def publish_due_posts(now=None):
+    """Make every due post visible and return the ids of those posts."""
+    now = now or tz.now()
+    post_ids = list(Post.objects.due(now).values_list('id', flat=True))
+    if post_ids:
+        # A post may have been unpublished, or moved to a hidden category,
+        # since it was selected: the UPDATE checks the conditions again.
+        Post.objects.due(now).filter(id__in=post_ids).update(
+            visible=True, updated_at=now)
+        posts_visibility_changed.send(sender=Post, post_ids=post_ids)
+    return post_ids
+
+
+def next_publication_at(now=None):
+    """Return the closest pub_date among scheduled posts, or None."""
+    return (
+        Post.objects.scheduled(now)
+        .aggregate(next_at=Min('pub_date'))['next_at']
+    )
@@ -0,0 +1,87 @@
+"""
+Category navigation with post counts.
+CategoryCount holds the number of visible posts per category, so pages
+never run the GROUP BY. Saving or deleting a post moves the counts by
+one; bulk updates and repairs recount the categories they touch. The
+rendered block is cached under the change marks of the counts and the
+categories: a page costs two cache reads.
+"""
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+from django.template.loader import render_to_string
+
+from . import versions
+from .models import Category, CategoryCount
+
+TEMPLATE = 'includes/category_sidebar.html'
+
+
+def refresh_counts(category_ids):
+    """Recount the visible posts of the given categories."""
+    category_ids = set(filter(None, category_ids))
+    if not category_ids:
+        return
+    counts = dict(
+        Category.objects.filter(pk__in=category_ids)
+        .annotate(visible_posts=Count('posts',
+                                      filter=Q(posts__visible=True)))
+        .values_list('pk', 'visible_posts')
+    )
+    saved = dict(
+        CategoryCount.objects.filter(category_id__in=counts)
+        .values_list('category_id', 'posts')
+    )
+    changed = [
+        CategoryCount(category_id=pk, posts=posts)
+        for pk, posts in counts.items() if saved.get(pk) != posts
+    ]
+    if not changed:
+        return
+    CategoryCount.objects.bulk_update(
+        [count for count in changed if count.category_id in saved],
+        ['posts'],
+    )
+    CategoryCount.objects.bulk_create(
+        [count for count in changed if count.category_id not in saved]
+    )
+    versions.touch(versions.CATEGORY_COUNTS)
+
+
+def move_post(saved, current):
+    """
+    Move one post from `saved` to `current`, both (category_id, visible),
+    with an UPDATE of each affected count.
+    """
+    deltas = {}
+    for (category_id, visible), delta in ((saved, -1), (current, 1)):
+        if category_id and visible:
+            deltas[category_id] = deltas.get(category_id, 0) + delta
+    missing = set()
+    for category_id, delta in deltas.items():
+        if delta and not CategoryCount.objects.filter(
+                category_id=category_id).update(posts=F('posts') + delta):
+            missing.add(category_id)
+    if missing:
+        # refresh_counts() creates the rows and touches the mark.
+        refresh_counts(missing)
+    elif any(deltas.values()):
+        versions.touch(versions.CATEGORY_COUNTS)
+
+
+def categories():
+    return (
+        Category.objects.filter(is_published=True, post_count__posts__gt=0)
+        .values('slug', 'title', 'post_count__posts')
+        .order_by('title')
+    )
+
+
+def render_sidebar():
+    key = 'blog:sidebar:{}:{}'.format(
+        *versions.marks(versions.CATEGORY_COUNTS, versions.CATEGORIES)
+    )
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string(TEMPLATE, {'categories': categories()})
+        cache.set(key, html)
+    return html
@@ -0,0 +1,235 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from django.utils import timezone as tz
+
+from . import connections, versions
+
+# Sent when posts become visible or hidden by a bulk UPDATE, i.e. without
+# going through ``Post.save()``: with ``post_ids`` by the scheduler, with
+# ``category`` or ``location`` when every post of it was affected.
+posts_visibility_changed = Signal()
+
+_batched_comment_deletes = ContextVar('batched_comment_deletes',
+                                      default=False)
+
+
+@contextmanager
+def batched_comment_deletes():
+    """
+    Skip the per-comment delete receivers; the caller updates the stats
+    and the change marks once for the whole batch (see blog.deletion).
+    """
+    token = _batched_comment_deletes.set(True)
+    try:
+        yield
+    finally:
+        _batched_comment_deletes.reset(token)
+
+
+@receiver(pre_delete, sender='blog.Category')
+def hide_category_posts(sender, instance, **kwargs):
+    # Posts outlive their category (SET_NULL) but are not shown without one.
+    instance.posts.update(visible=False)
+    posts_visibility_changed.send(sender=sender, category=instance)
+
+
+@receiver(posts_visibility_changed)
+def touch_visibility(sender, post_ids=(), **kwargs):
+    versions.touch(versions.POSTS, *map(versions.post_scope, post_ids))
+
+
+@receiver(posts_visibility_changed)
+def count_visibility(sender, post_ids=(), category=None, **kwargs):
+    from . import sidebar
+    from .models import Post
+
+    category_ids = set(
+        Post.objects.filter(pk__in=post_ids)
+        .values_list('category_id', flat=True)
+    ) if post_ids else set()
+    if category is not None:
+        category_ids.add(category.pk)
+    sidebar.refresh_counts(category_ids)
+
+
+@receiver([post_save, post_delete], sender='blog.Post')
+def touch_post(sender, instance, **kwargs):
+    versions.touch(versions.POSTS, versions.post_scope(instance.pk))
+
+
+@receiver(post_save, sender='blog.Post')
+def count_post(sender, instance, created, **kwargs):
+    from . import sidebar
+
+    # Connected before count_saved_post, which resets _saved_visible.
+    saved_category_id = getattr(instance, '_saved_category_id', None)
+    saved_visible = False if created else getattr(
+        instance, '_saved_visible', None)
+    if saved_visible is None:
+        # Loaded without its visible flag: nothing to move from.
+        sidebar.refresh_counts({instance.category_id, saved_category_id})
+    else:
+        sidebar.move_post((saved_category_id, saved_visible),
+                          (instance.category_id, instance.visible))
+    instance._saved_category_id = instance.category_id
+
+
+@receiver(post_delete, sender='blog.Post')
+def uncount_post(sender, instance, **kwargs):
+    from . import sidebar
+
+    sidebar.move_post((instance.category_id, instance.visible), (None, False))
+
+
+@receiver(post_save, sender='blog.Category')
+def create_category_count(sender, instance, created, **kwargs):
+    from .models import CategoryCount
+
+    if created:
+        CategoryCount.objects.create(category=instance)
+
+
+@receiver(posts_visibility_changed)
+def count_author_visibility(sender, post_ids=(), category=None, **kwargs):
+    from . import stats
+    from .models import Post
+
+    posts = Post.objects.none()
+    if post_ids:
+        posts = Post.objects.filter(pk__in=post_ids)
+    if category is not None:
+        posts |= Post.objects.filter(category=category)
+    author_ids = set(posts.values_list('author_id', flat=True))
+    if author_ids:
+        stats.recount(author_ids)
+
+
+@receiver(post_save, sender='blog.Post')
+def count_saved_post(sender, instance, created, **kwargs):
+    from . import stats
+
+    saved_visible = getattr(instance, '_saved_visible', None)
+    saved_author_id = getattr(instance, '_saved_author_id', None)
+    if created:
+        stats.bump(instance.author_id, posts=1,
+                   published_posts=int(instance.visible))
+    elif saved_visible is None or saved_author_id != instance.author_id:
+        # The post and its comments may have changed hands.
+        stats.recount({saved_author_id, instance.author_id} - {None})
+    elif saved_visible != instance.visible:
+        stats.bump(instance.author_id,
+                   published_posts=int(instance.visible) - saved_visible)
+    if created:
+        # Activity is what the user wrote, not later edits by anyone.
+        stats.touch_activity(instance.author_id, at=instance.created_at)
+    instance._saved_visible = instance.visible
+    instance._saved_author_id = instance.author_id
+
+
+@receiver(post_delete, sender='blog.Post')
+def count_deleted_post(sender, instance, **kwargs):
+    from . import stats
+
+    stats.bump(instance.author_id, posts=-1,
+               published_posts=-int(instance.visible))
+
+
+@receiver(post_save, sender='blog.Comment')
+def count_saved_comment(sender, instance, created, **kwargs):
+    from . import stats
+
+    if created:
+        stats.bump_post_author(instance.post_id, comments_received=1)
+        stats.touch_activity(instance.author_id, at=instance.created_at)
+
+
+@receiver(post_delete, sender='blog.Comment')
+def count_deleted_comment(sender, instance, **kwargs):
+    from . import stats
+
+    if _batched_comment_deletes.get():
+        return
+
+    stats.bump_post_author(instance.post_id, comments_received=-1)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_user_stats(sender, instance, created, **kwargs):
+    from .models import UserStats
+
+    if created:
+        UserStats.objects.create(user=instance)
+
+
+@receiver([post_save, post_delete], sender='blog.Comment')
+def touch_comment(sender, instance, signal, **kwargs):
+    from .models import Post
+
+    if signal is post_delete and _batched_comment_deletes.get():
+        return
+
+    # Comments carry no timestamp of their own: a post is updated when
+    # its comment thread changes.
+    Post.objects.filter(pk=instance.post_id).update(updated_at=tz.now())
+    versions.touch(versions.COMMENTS, versions.post_scope(instance.post_id))
+
+
+@receiver(post_save, sender='blog.Comment')
+def publish_comment(sender, instance, created, **kwargs):
+    from . import live
+
+    if created:
+        transaction.on_commit(lambda: live.publish_comment(instance))
+
+
+@receiver([post_save, post_delete], sender='blog.Category')
+def touch_category(sender, **kwargs):
+    versions.touch(versions.CATEGORIES)
+
+
+@receiver([post_save, post_delete], sender='blog.Location')
+def touch_location(sender, **kwargs):
+    versions.touch(versions.LOCATIONS)
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def touch_user(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    versions.touch(versions.USERS)
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def forget_username(sender, instance, **kwargs):
+    from . import users
+
+    users.forget(instance.username)
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    # Per-connection settings; journal_mode=wal also sticks to the file.
+    # Pooled connections (blogicum.sqlite_pool) already have them.
+    if (connection.vendor != 'sqlite'
+            or getattr(connection, 'reused_connection', False)):
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    connections.stats.record(getattr(connection, 'reused_connection', False))
+
+
+@receiver(request_started)
+def check_connections(sender, **kwargs):
+    connections.check_connections()
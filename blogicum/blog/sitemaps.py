@@ -0,0 +1,139 @@
+"""
+Sitemaps of posts, categories and profiles.
+Posts are split into chunks of fixed Post.id ranges, so every chunk is a
+cheap range scan and only the chunks that changed have to be rebuilt.
+"""
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.sitemaps import Sitemap
+from django.db.models import Count, ExpressionWrapper, F, IntegerField, Max
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from .models import Category, Post
+
+User = get_user_model()
+
+POSTS_PER_CHUNK = 10000
+
+Site = namedtuple('Site', 'domain name')
+
+
+class PostChunkSitemap(Sitemap):
+    changefreq = 'weekly'
+    limit = POSTS_PER_CHUNK
+
+    def __init__(self, chunk):
+        self.chunk = chunk
+
+    def items(self):
+        first_id = self.chunk * POSTS_PER_CHUNK
+        return (
+            Post.objects.published()
+            .filter(id__gte=first_id, id__lt=first_id + POSTS_PER_CHUNK)
+            .only('id', 'updated_at')
+            .order_by('id')
+        )
+
+    def location(self, post):
+        return reverse('blog:post_detail', kwargs={'post_id': post.id})
+
+    def lastmod(self, post):
+        return post.updated_at
+
+
+class CategorySitemap(Sitemap):
+    changefreq = 'daily'
+
+    def items(self):
+        return Category.objects.filter(is_published=True).order_by('id')
+
+    def location(self, category):
+        return reverse('blog:category_posts',
+                       kwargs={'category_slug': category.slug})
+
+    def lastmod(self, category):
+        return category.updated_at
+
+
+class ProfileSitemap(Sitemap):
+    changefreq = 'daily'
+
+    def items(self):
+        return (
+            User.objects.filter(posts__visible=True)
+            .annotate(last_post_update=Max('posts__updated_at'))
+            .only('username')
+            .order_by('id')
+        )
+
+    def location(self, user):
+        return reverse('blog:profile', kwargs={'username': user.username})
+
+    def lastmod(self, user):
+        return user.last_post_update
+
+
+SECTIONS = {
+    'categories': CategorySitemap,
+    'profiles': ProfileSitemap,
+}
+
+
+def chunk_stats():
+    """
+    Map every non-empty chunk to (post count, last update)
+    with a single GROUP BY query.
+    """
+    rows = (
+        Post.objects.published()
+        .order_by()
+        .annotate(chunk=ExpressionWrapper(F('id') / POSTS_PER_CHUNK,
+                                          output_field=IntegerField()))
+        .values('chunk')
+        .annotate(count=Count('id'), last_updated=Max('updated_at'))
+    )
+    return {
+        row['chunk']: (row['count'], row['last_updated']) for row in rows
+    }
+
+
+def section_pages():
+    for section, sitemap in SECTIONS.items():
+        for page in sitemap().paginator.page_range:
+            yield section, page
+
+
+def section_path(section, page=1):
+    if page == 1:
+        return reverse('blog:sitemap_section', kwargs={'section': section})
+    return reverse('blog:sitemap_section_page',
+                   kwargs={'section': section, 'page': page})
+
+
+def chunk_path(chunk):
+    return reverse('blog:sitemap_posts', kwargs={'chunk': chunk})
+
+
+def render_urlset(sitemap, domain, protocol, page=1):
+    urls = sitemap.get_urls(page=page, site=Site(domain, domain),
+                            protocol=protocol)
+    return render_to_string('sitemap.xml', {'urlset': urls})
+
+
+def index_entries(domain, protocol, stats):
+    """Yield (location, lastmod) of every sitemap listed in the index."""
+    def absolute(path):
+        return f'{protocol}://{domain}{path}'
+
+    for section, page in section_pages():
+        yield absolute(section_path(section, page)), None
+    for chunk, (_, last_updated) in sorted(stats.items()):
+        yield absolute(chunk_path(chunk)), last_updated
+
+
+def render_index(domain, protocol, stats):
+    return render_to_string('blog/sitemap_index.xml', {
+        'entries': index_entries(domain, protocol, stats),
+    })
@@ -0,0 +1,107 @@
+"""
+Profile statistics.
+UserStats rows are moved by F() updates from the Post and Comment
+signals, so a profile reads its totals from one row. Bulk visibility
+changes recount the authors they touch; `manage.py repair_user_stats`
+recounts everyone. Archived posts and their comments stay in the totals.
+The last activity is when the user last wrote a post or a comment;
+comments frozen in the archive are not searched for it.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.utils import timezone as tz
+
+from .models import ArchivedPost, Comment, Post, UserStats
+
+User = get_user_model()
+
+# Users recounted per query, below SQLite's 999 variables.
+RECOUNT_BATCH_SIZE = 500
+
+
+def bump(user_id, **deltas):
+    """Add `deltas` to the counters of a user."""
+    UserStats.objects.filter(user_id=user_id).update(**{
+        field: F(field) + delta for field, delta in deltas.items()
+    })
+
+
+def bump_post_author(post_id, **deltas):
+    """Add `deltas` to the counters of the author of a post."""
+    UserStats.objects.filter(user__posts=post_id).update(**{
+        field: F(field) + delta for field, delta in deltas.items()
+    })
+
+
+def touch_activity(*user_ids, at=None):
+    """Record that the users wrote a post or a comment `at` (now)."""
+    UserStats.objects.filter(user_id__in=user_ids).update(
+        last_activity=at or tz.now())
+
+
+def _latest(queryset, field):
+    return Subquery(
+        queryset.order_by(f'-{field}').values(field)[:1]
+    )
+
+
+def _archived(total):
+    return Subquery(
+        ArchivedPost.objects.filter(author=OuterRef('pk'))
+        .values('author')
+        .annotate(total=total)
+        .values('total')
+    )
+
+
+def _recount(user_ids):
+    rows = User.objects.filter(pk__in=user_ids).annotate(
+        post_total=Count('posts', distinct=True),
+        published_total=Count('posts', filter=Q(posts__visible=True),
+                              distinct=True),
+        comment_total=Subquery(
+            Comment.objects.filter(post__author=OuterRef('pk'))
+            .values('post__author')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        archived_total=_archived(Count('pk')),
+        archived_comments=_archived(Sum('comment_count')),
+        last_post=_latest(Post.objects.filter(author=OuterRef('pk')),
+                          'created_at'),
+        last_archived=_latest(
+            ArchivedPost.objects.filter(author=OuterRef('pk')),
+            'created_at'),
+        last_comment=_latest(Comment.objects.filter(author=OuterRef('pk')),
+                             'created_at'),
+    ).values_list('pk', 'post_total', 'published_total', 'comment_total',
+                  'archived_total', 'archived_comments',
+                  'last_post', 'last_archived', 'last_comment')
+    stats = []
+    for (pk, posts, published, comments, archived, archived_comments,
+         *activity) in rows:
+        # Subqueries give NULL when there is nothing to count.
+        archived = archived or 0
+        stats.append(UserStats(
+            user_id=pk, posts=posts + archived,
+            published_posts=published + archived,
+            comments_received=(comments or 0) + (archived_comments or 0),
+            last_activity=max(filter(None, activity), default=None),
+        ))
+    with transaction.atomic():
+        UserStats.objects.filter(
+            user_id__in=[row.user_id for row in stats]).delete()
+        UserStats.objects.bulk_create(stats)
+    return len(stats)
+
+
+def recount(user_ids=None):
+    """Recompute the stats of `user_ids` (every user when None)."""
+    if user_ids is None:
+        user_ids = User.objects.order_by('pk').values_list('pk', flat=True)
+    user_ids = list(user_ids)
+    return sum(
+        _recount(user_ids[start:start + RECOUNT_BATCH_SIZE])
+        for start in range(0, len(user_ids), RECOUNT_BATCH_SIZE)
+    )
@@ -0,0 +1,12 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog.sidebar import render_sidebar
+
+register = template.Library()
+
+
+@register.simple_tag
+def category_sidebar():
+    """Cached category navigation, see blog.sidebar."""
+    return mark_safe(render_sidebar())
@@ -1,21 +1,91 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from blogicum.routers import read_from_replica
+
+from . import api, async_views, feeds, views
 
 app_name = 'blog'
 
+
+def read_only(view):
+    view = read_from_replica(view)
+    if settings.ASYNC_VIEWS:
+        return async_views.in_thread_pool(view)
+    return view
+
+
 urlpatterns = [
     path(
         '',
-        views.IndexListView.as_view(),
+        read_only(views.IndexListView.as_view()),
         name='index'
     ),
 
+    path(
+        'feeds/rss/',
+        read_only(feeds.cached_feed(feeds.PostsFeed())),
+        name='feed_rss'
+    ),
+    path(
+        'feeds/atom/',
+        read_only(feeds.cached_feed(feeds.PostsAtomFeed())),
+        name='feed_atom'
+    ),
+
+    path(
+        'sitemap.xml',
+        views.sitemap_index,
+        name='sitemap'
+    ),
+    path(
+        'sitemap-posts-<int:chunk>.xml',
+        views.sitemap_posts,
+        name='sitemap_posts'
+    ),
+    path(
+        'sitemap-<slug:section>-<int:page>.xml',
+        views.sitemap_section,
+        name='sitemap_section_page'
+    ),
+    path(
+        'sitemap-<slug:section>.xml',
+        views.sitemap_section,
+        name='sitemap_section'
+    ),
+
+    path(
+        'archive/',
+        views.archive_index,
+        name='archive'
+    ),
+    path(
+        'archive/<int:year>/<int:month>/',
+        views.archive_month,
+        name='archive_month'
+    ),
+
     path(
         'category/<slug:category_slug>/',
-        views.CategoryPostsListView.as_view(),
+        read_only(views.CategoryPostsListView.as_view()),
         name='category_posts'
     ),
+    path(
+        'category/<slug:category_slug>/rss/',
+        read_only(feeds.cached_feed(feeds.CategoryPostsFeed())),
+        name='category_feed_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/atom/',
+        read_only(feeds.cached_feed(feeds.CategoryPostsAtomFeed())),
+        name='category_feed_atom'
+    ),
+
+    path(
+        'location/<int:location_id>/',
+        read_only(views.location_posts),
+        name='location_posts'
+    ),
 
     path(
         'posts/create/',
@@ -24,7 +94,7 @@ urlpatterns = [
     ),
     path(
         'posts/<int:post_id>/',
-        views.PostDetailView.as_view(),
+        read_only(views.PostDetailView.as_view()),
         name='post_detail'
     ),
     path(
@@ -40,9 +110,19 @@ urlpatterns = [
 
     path(
         'profile/<slug:username>/',
-        views.ProfileListView.as_view(),
+        read_only(views.ProfileListView.as_view()),
         name='profile'
     ),
+    path(
+        'profile/<slug:username>/rss/',
+        read_only(feeds.cached_feed(feeds.ProfilePostsFeed())),
+        name='profile_feed_rss'
+    ),
+    path(
+        'profile/<slug:username>/atom/',
+        read_only(feeds.cached_feed(feeds.ProfilePostsAtomFeed())),
+        name='profile_feed_atom'
+    ),
     path(
         'profile_edit/',
         views.ProfileUpdateView.as_view(),
@@ -54,6 +134,12 @@ urlpatterns = [
         views.add_comment,
         name='add_comment'
     ),
+    path(
+        'posts/<int:post_id>/comments/stream/',
+        async_views.comment_stream if settings.ASYNC_VIEWS
+        else views.comment_stream,
+        name='comment_stream'
+    ),
     path(
         'posts/<int:post_id>/edit_comment/<int:comment_id>/',
         views.CommentUpdateView.as_view(),
@@ -64,4 +150,30 @@ urlpatterns = [
         views.CommentDeleteView.as_view(),
         name='delete_comment'
     ),
+
+    path(
+        'api/posts/',
+        api.posts,
+        name='api_posts'
+    ),
+    path(
+        'api/posts/batch/',
+        api.posts_batch,
+        name='api_posts_batch'
+    ),
+    path(
+        'api/posts/<int:post_id>/',
+        api.post_detail,
+        name='api_post'
+    ),
+    path(
+        'api/posts/<int:post_id>/comments/',
+        api.post_comments,
+        name='api_post_comments'
+    ),
+    path(
+        'api/categories/',
+        api.categories,
+        name='api_categories'
+    ),
 ]
@@ -0,0 +1,49 @@
+"""
+Username lookups for profile pages.
+The id behind a username is cached, so a profile page reads its user by
+primary key and filters posts by author_id without joining auth_user.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+
+User = get_user_model()
+
+CACHE_TIMEOUT = 60 * 60 * 24
+# A miss is kept briefly: any URL can ask for a username that is not
+# there, and the cache should not fill up with them.
+MISS_TIMEOUT = 60
+
+
+def _key(username):
+    return f'blog:user_id:{username}'
+
+
+def user_id(username):
+    """Id of the user named `username`, or None."""
+    key = _key(username)
+    pk = cache.get(key)
+    if pk is None:
+        # 0 remembers that there is no such user.
+        pk = User.objects.filter(username=username).values_list(
+            'pk', flat=True).first() or 0
+        cache.set(key, pk, CACHE_TIMEOUT if pk else MISS_TIMEOUT)
+    return pk or None
+
+
+def forget(*usernames):
+    cache.delete_many([_key(username) for username in usernames])
+
+
+def get_profile(username):
+    """The user named `username`, or 404."""
+    profiles = User.objects.select_related('stats', 'pending_deletion')
+    profile = profiles.filter(pk=user_id(username)).first()
+    if profile is None or profile.username != username:
+        # Renamed or deleted without going through the signals.
+        forget(username)
+        profile = get_object_or_404(profiles, username=username)
+    if hasattr(profile, 'pending_deletion'):
+        raise Http404('User is being deleted')
+    return profile
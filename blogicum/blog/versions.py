@@ -0,0 +1,51 @@
+"""
+Change marks for cache keys and HTTP validators.
+Every write touches the scopes whose pages it may change; the mark of a
+scope is the time of its last touch.
+"""
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+
+POSTS = 'posts'
+CATEGORIES = 'categories'
+LOCATIONS = 'locations'
+USERS = 'users'
+ARCHIVE = 'archive'
+CATEGORY_COUNTS = 'category_counts'
+COMMENTS = 'comments'
+
+# Marks made up for scopes nobody has touched (every post a reader opens
+# has its own scope) expire, so they do not pile up in the cache.
+UNTOUCHED_TIMEOUT = 60 * 60 * 24
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def _key(scope):
+    return f'blog:changed:{scope}'
+
+
+def touch(*scopes):
+    now = time.time()
+    cache.set_many({_key(scope): now for scope in scopes}, timeout=None)
+
+
+def marks(*scopes):
+    """Return the marks of scopes in the given order."""
+    keys = [_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    now = time.time()
+    for key in keys:
+        if key not in found:
+            # Unknown after a cache flush: assume it has just changed.
+            cache.add(key, now, timeout=UNTOUCHED_TIMEOUT)
+            found[key] = cache.get(key, now)
+    return tuple(found[key] for key in keys)
+
+
+def last_change(*scopes):
+    return datetime.fromtimestamp(max(marks(*scopes)), tz=timezone.utc)
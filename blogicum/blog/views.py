@@ -1,11 +1,17 @@
+from datetime import date
+from http import HTTPStatus
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
+from django.core.paginator import InvalidPage, Paginator
 from django.db.models import Count
-from django.http import Http404
-from django.shortcuts import get_object_or_404, redirect
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone as tz
+from django.utils.dateparse import parse_datetime
+from django.utils.decorators import method_decorator
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -14,27 +20,50 @@ from django.views.generic import (
     UpdateView,
 )
 
+from . import (
+    archive,
+    comment_buffer,
+    deletion,
+    keyset,
+    live,
+    ratelimit,
+    sitemaps,
+    users,
+    versions,
+)
+from .conditional import (
+    archive_validators,
+    category_validators,
+    conditional_page,
+    index_validators,
+    location_validators,
+    post_detail_validators,
+    profile_validators,
+    public_cache,
+)
 from .forms import CommentForm, PostForm, UserForm
+from .locations import top_locations
 from .mixins import CommentMixin, DeleteMixin, DispatchMixin, EditMixin
-from .models import Category, Post
+from .models import ArchivedPost, Category, Location, Post
+from .users import get_profile
 
 PAGINATE_BY = 10
 
 
+@method_decorator(conditional_page(index_validators), name="get")
 class IndexListView(ListView):
     model = Post
     paginate_by = PAGINATE_BY
     template_name = "blog/index.html"
     ordering = "-pub_date"
     queryset = (
-        Post.objects.select_related("location", "author", "category")
-        .filter(is_published=True,
-                category__is_published=True,
-                pub_date__lte=tz.now())
+        Post.objects.published()
+        .select_related("location", "author", "category")
         .annotate(comment_count=Count("comments"))
     )
 
 
+@method_decorator(conditional_page(category_validators), name="get")
 class CategoryPostsListView(ListView):
     model = Post
     paginate_by = PAGINATE_BY
@@ -46,13 +75,36 @@ class CategoryPostsListView(ListView):
         )
 
         return (
-            category.posts.select_related("location", "author", "category")
-            .filter(is_published=True, pub_date__lte=tz.now())
+            category.posts.filter(visible=True)
+            .select_related("location", "author", "category")
             .annotate(comment_count=Count("comments"))
             .order_by("-pub_date")
         )
 
 
+@conditional_page(location_validators)
+def location_posts(request, location_id):
+    location = get_object_or_404(Location, pk=location_id, is_published=True)
+    cursor = request.GET.get("after")
+    posts = list(
+        keyset.after(location.posts.published(), cursor)
+        .select_related("location", "author", "category")
+        .annotate(comment_count=Count("comments"))
+        .order_by("-pub_date", "-id")[:PAGINATE_BY + 1]
+    )
+    next_cursor = None
+    if len(posts) > PAGINATE_BY:
+        posts = posts[:PAGINATE_BY]
+        next_cursor = keyset.encode_cursor(posts[-1].pub_date, posts[-1].id)
+    return render(request, "blog/location.html", {
+        "location": location,
+        "posts": posts,
+        "cursor": cursor,
+        "next_cursor": next_cursor,
+        "top_locations": top_locations(),
+    })
+
+
 class PostCreateView(LoginRequiredMixin, CreateView):
     model = Post
     form_class = PostForm
@@ -67,24 +119,41 @@ class PostCreateView(LoginRequiredMixin, CreateView):
                        kwargs={"username": self.request.user.username})
 
 
+@method_decorator(conditional_page(post_detail_validators), name="get")
 class PostDetailView(DetailView):
     model = Post
+    queryset = Post.objects.alive()
     template_name = "blog/detail.html"
     pk_url_kwarg = "post_id"
     paginate_by = PAGINATE_BY
 
+    def get(self, request, *args, **kwargs):
+        try:
+            return super().get(request, *args, **kwargs)
+        except Http404:
+            archived = (
+                ArchivedPost.objects
+                .select_related("author", "category", "location")
+                .filter(pk=kwargs["post_id"], category__is_published=True)
+                .first()
+            )
+            if archived is None:
+                raise
+        for comment in archived.comments:
+            comment["created_at"] = parse_datetime(comment["created_at"])
+        return render(request, "blog/archived_detail.html",
+                      {"post": archived})
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         post = get_object_or_404(Post, pk=self.kwargs.get("post_id"))
 
-        if not (post.author == self.request.user
-           or (post.is_published and post.category.is_published
-               and post.pub_date <= tz.now())):
+        if not (post.author == self.request.user or post.visible):
 
             raise Http404("Page does not exist")
 
         context["comments"] = (
-            self.object.comments
+            self.object.comments.alive()
             .select_related("author")
             .filter(
                 post_id__is_published=True,
@@ -93,6 +162,8 @@ class PostDetailView(DetailView):
         )
 
         context["form"] = CommentForm()
+        # A stream holds a worker thread under WSGI, see async_views.
+        context["live_comments"] = settings.ASYNC_VIEWS
         return context
 
 
@@ -115,25 +186,31 @@ class PostDeleteView(DispatchMixin, LoginRequiredMixin,
     success_url = reverse_lazy("blog:index")
     pk_url_kwarg = "post_id"
 
+    def delete(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        deletion.delete_post(self.object)
+        return redirect(self.get_success_url())
+
 
+@method_decorator(conditional_page(profile_validators), name="get")
 class ProfileListView(ListView):
     model = Post
     paginate_by = PAGINATE_BY
     template_name = "blog/profile.html"
 
     def get_queryset(self):
+        self.profile = get_profile(self.kwargs["username"])
         return (
-            self.model.objects.select_related("author")
-            .filter(author__username=self.kwargs["username"])
+            self.model.objects.alive()
+            .select_related("location", "author", "category")
+            .filter(author_id=self.profile.pk)
             .annotate(comment_count=Count("comments"))
             .order_by("-pub_date")
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["profile"] = get_object_or_404(
-            User, username=self.kwargs["username"]
-        )
+        context["profile"] = self.profile
         return context
 
 
@@ -148,6 +225,8 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     def form_valid(self, form):
         form.instance.author = self.request.user
         form.save()
+        if "username" in form.changed_data:
+            users.forget(form.initial["username"])
         return super().form_valid(form)
 
     def get_success_url(self):
@@ -155,18 +234,60 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
                        kwargs={"username": self.request.user.username})
 
 
+def comment_retry_after(user_id, post_id):
+    limits = settings.COMMENT_RATE_LIMITS
+    return max(
+        ratelimit.retry_after("comment:user", user_id, *limits["user"]),
+        ratelimit.retry_after("comment:post", post_id, *limits["post"]),
+    )
+
+
+def count_comment(user_id, post_id):
+    # Only accepted comments count against the limits.
+    limits = settings.COMMENT_RATE_LIMITS
+    ratelimit.hit("comment:user", user_id, limits["user"][1])
+    ratelimit.hit("comment:post", post_id, limits["post"][1])
+
+
 @login_required
 def add_comment(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    retry_after = comment_retry_after(request.user.pk, post_id)
+    if retry_after:
+        return HttpResponse(
+            "Слишком много комментариев, попробуйте позже.",
+            status=HTTPStatus.TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    if settings.COMMENT_BUFFER:
+        if not Post.objects.alive().filter(pk=post_id).exists():
+            raise Http404("Page does not exist")
+        post = Post(pk=post_id)
+    else:
+        post = get_object_or_404(Post.objects.alive(), pk=post_id)
     form = CommentForm(request.POST)
     if form.is_valid():
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
-        comment.save()
+        count_comment(request.user.pk, post_id)
+        if settings.COMMENT_BUFFER:
+            comment_buffer.buffer.add(comment)
+        else:
+            comment.save()
     return redirect("blog:post_detail", post_id=post_id)
 
 
+def comment_stream(request, post_id):
+    # Without ASYNC_VIEWS a waiting stream would hold a worker thread, so
+    # it answers with what is in the database and lets the client retry.
+    after = live.last_event_id(request)
+    events = live.catch_up(request, post_id, after)
+    if events is None:
+        raise Http404("Page does not exist")
+    return live.event_response(events)
+
+
 class CommentUpdateView(LoginRequiredMixin, CommentMixin,
                         UpdateView, EditMixin):
     pass
@@ -175,3 +296,60 @@ class CommentUpdateView(LoginRequiredMixin, CommentMixin,
 class CommentDeleteView(LoginRequiredMixin, CommentMixin,
                         DeleteView, DeleteMixin):
     pass
+
+
+@public_cache(versions.POSTS, versions.CATEGORIES, versions.USERS)
+def sitemap_index(request):
+    return HttpResponse(
+        sitemaps.render_index(request.get_host(), request.scheme,
+                              sitemaps.chunk_stats()),
+        content_type='application/xml',
+    )
+
+
+@public_cache(versions.POSTS, versions.CATEGORIES, versions.USERS)
+def sitemap_section(request, section, page=1):
+    if section not in sitemaps.SECTIONS:
+        raise Http404('Sitemap does not exist')
+    try:
+        content = sitemaps.render_urlset(
+            sitemaps.SECTIONS[section](), request.get_host(), request.scheme,
+            page=page,
+        )
+    except InvalidPage:
+        raise Http404('Sitemap page does not exist')
+    return HttpResponse(content, content_type='application/xml')
+
+
+@public_cache(versions.POSTS)
+def sitemap_posts(request, chunk):
+    return HttpResponse(
+        sitemaps.render_urlset(sitemaps.PostChunkSitemap(chunk),
+                               request.get_host(), request.scheme),
+        content_type='application/xml',
+    )
+
+
+@conditional_page(archive_validators)
+def archive_index(request):
+    return render(request, "blog/archive.html", {
+        "months": [
+            date(year, month, 1) for year, month in archive.months()
+        ],
+    })
+
+
+@conditional_page(archive_validators)
+def archive_month(request, year, month):
+    posts = archive.month_posts(year, month)
+    if posts is None:
+        raise Http404("Page does not exist")
+    try:
+        page_obj = Paginator(posts, PAGINATE_BY).page(
+            request.GET.get("page", 1))
+    except InvalidPage:
+        raise Http404("Page does not exist")
+    return render(request, "blog/archive_month.html", {
+        "month": date(year, month, 1),
+        "page_obj": page_obj,
+    })
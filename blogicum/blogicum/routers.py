@@ -0,0 +1,88 @@
+"""
+Primary/replica routing.
+Views wrapped with read_from_replica read from the 'replica' database
+when it is configured; every write, and every read of a session that
+wrote in the last REPLICA_STICKY_SECONDS, goes to 'default'. The replica
+is a copy refreshed by `manage.py sync_replica`, so it lags behind.
+"""
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.deprecation import MiddlewareMixin
+
+REPLICA = 'replica'
+
+STICKY_SESSION_KEY = '_primary_until'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def has_replica():
+    return REPLICA in settings.DATABASES
+
+
+def is_sticky(request):
+    session = getattr(request, 'session', None)
+    return (session is not None
+            and session.get(STICKY_SESSION_KEY, 0) > time.time())
+
+
+def read_from_replica(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not has_replica() or is_sticky(request):
+            return view(request, *args, **kwargs)
+        token = _use_replica.set(True)
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                # Templates evaluate querysets lazily.
+                response.render()
+            return response
+        finally:
+            _use_replica.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and has_replica():
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same rows.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema with the data from sync_replica.
+        return db != REPLICA
+
+
+class StickyPrimaryMiddleware(MiddlewareMixin):
+    """
+    Send a session to the primary for a while after it writes.
+    MiddlewareMixin makes it async-capable, so under ASGI it does not
+    force the async views back into a thread.
+    """
+
+    def __init__(self, get_response):
+        if not has_replica():
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and hasattr(request, 'session'):
+            request.session[STICKY_SESSION_KEY] = (
+                time.time() + settings.REPLICA_STICKY_SECONDS
+            )
+        return response
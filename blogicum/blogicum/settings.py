@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -19,6 +20,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
     'debug_toolbar',
@@ -28,6 +30,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'blogicum.routers.StickyPrimaryMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -58,6 +61,11 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
+ASGI_APPLICATION = 'blogicum.asgi.application'
+
+# Serve the read-only pages with blog.async_views; only worth it under ASGI.
+ASYNC_VIEWS = False
+
 
 DATABASES = {
     'default': {
@@ -66,6 +74,23 @@ DATABASES = {
     }
 }
 
+# A read-only copy of the database for the listing and detail pages, kept
+# current by `manage.py sync_replica`; see routers.py.
+if os.getenv('DJANGO_DB_REPLICA'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': Path(os.environ['DJANGO_DB_REPLICA']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['blogicum.routers.ReplicaRouter']
+
+# Seconds a session keeps reading from 'default' after a write.
+REPLICA_STICKY_SECONDS = 30
+
+# PRAGMA name -> value run on every new SQLite connection.
+SQLITE_PRAGMAS = {}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -100,6 +125,33 @@ LOGIN_REDIRECT_URL = 'blog:index'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+
+# Visible posts older than this move to the archive (archive_posts).
+ARCHIVE_HORIZON_DAYS = 2 * 365
+
+# (comments, seconds) accepted per user and per post by blog:add_comment.
+COMMENT_RATE_LIMITS = {
+    'user': (10, 60),
+    'post': (120, 60),
+}
+
+# Queue new comments and insert them in batches, see blog/comment_buffer.py.
+COMMENT_BUFFER = False
+
+COMMENT_BUFFER_DELAY = 0.5
+
+COMMENT_BUFFER_SIZE = 200
+
+# Posts and users with more dependent rows are hidden and left to
+# reap_deletions instead of being deleted in the request, see
+# blog/deletion.py.
+DELETE_SYNC_LIMIT = 1000
+
+# Unfiltered admin changelists larger than this show the database's row
+# estimate instead of running COUNT(*), see blog/paginators.py.
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
 STATIC_URL = 'static/'
 
 STATICFILES_DIRS = [
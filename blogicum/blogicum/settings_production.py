@@ -0,0 +1,112 @@
+"""
+Production settings.
+Run with DJANGO_SETTINGS_MODULE=blogicum.settings_production.
+"""
+import os
+
+from .settings import *  # noqa: F401, F403
+from .settings import (
+    BASE_DIR,
+    DATABASES,
+    INSTALLED_APPS,
+    MIDDLEWARE,
+    SECRET_KEY,
+    TEMPLATES,
+)
+
+DEBUG = False
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'debug_toolbar']
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith('debug_toolbar.')
+]
+
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', SECRET_KEY)
+
+ALLOWED_HOSTS = os.getenv('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
+
+# Templates are parsed once per process and kept by the cached loader;
+# APP_DIRS has to be off once loaders are listed explicitly.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+# Compile every project template when a worker starts (see warmup.py).
+WARM_UP_TEMPLATES = True
+
+# Hashed file names let static files be cached forever; build them with
+# `manage.py build_static`, which also writes .gz/.br variants.
+STATIC_ROOT = BASE_DIR / 'static'
+
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+)
+
+# Serve STATIC_ROOT through blogicum.staticfiles.serve when no front
+# server does it.
+SERVE_STATIC = True
+
+# Set when the project is served by an ASGI server (blogicum.asgi).
+ASYNC_VIEWS = os.getenv('DJANGO_ASYNC_VIEWS') == '1'
+
+# Keep connections open across requests (seconds, empty for no limit)
+# and check them before use; connections that do get closed go back to a
+# small per-process pool (see sqlite_pool/base.py).
+CONN_MAX_AGE = os.getenv('DJANGO_CONN_MAX_AGE', '600')
+
+DATABASES = {
+    alias: {
+        **database,
+        'ENGINE': 'blogicum.sqlite_pool',
+        'CONN_MAX_AGE': int(CONN_MAX_AGE) if CONN_MAX_AGE else None,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'pool_size': 8},
+    }
+    for alias, database in DATABASES.items()
+}
+
+# WAL lets readers work while a writer commits; writers wait for each
+# other up to busy_timeout instead of failing with "database is locked".
+# NORMAL sync is safe with WAL (a power loss may drop the last commits,
+# never corrupt the file).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'memory',
+}
+
+# Change marks behind ETags and cached fragments have to be shared by all
+# worker processes.
+# Past MAX_ENTRIES the file cache deletes a random third of its files,
+# and a lost change mark reads as "just changed": every ETag, cached page
+# and fragment under it goes, and rate-limit windows start over. Size it
+# for the real key count: a mark per post written or read in the last
+# day, cached pages and fragments, one id per username looked up and the
+# rate-limit counters of the current window.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': int(
+                os.getenv('DJANGO_CACHE_MAX_ENTRIES', '1000000')),
+        },
+    },
+}
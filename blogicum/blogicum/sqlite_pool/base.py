@@ -0,0 +1,85 @@
+"""
+SQLite backend that keeps closed connections for reuse.
+Opening a Django SQLite connection registers some thirty SQL functions
+and runs the connection_created setup. With CONN_MAX_AGE every thread
+keeps its own connection anyway; this pool covers the connections that
+do get closed (max age reached, errors, short-lived threads of a
+threaded worker). Up to OPTIONS['pool_size'] of them are handed to the
+next thread instead of being closed.
+
+    'ENGINE': 'blogicum.sqlite_pool',
+    'OPTIONS': {'pool_size': 8},
+"""
+import queue
+import threading
+
+from django.db.backends.sqlite3 import base
+
+Database = base.Database
+
+DEFAULT_POOL_SIZE = 8
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    # True when the current connection came from the pool.
+    reused_connection = False
+
+    @property
+    def pool(self):
+        key = (self.alias, str(self.settings_dict['NAME']))
+        with self._pools_lock:
+            if key not in self._pools:
+                self._pools[key] = queue.LifoQueue(self.settings_dict[
+                    'OPTIONS'].get('pool_size', DEFAULT_POOL_SIZE))
+            return self._pools[key]
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool_size', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        while True:
+            try:
+                connection = self.pool.get_nowait()
+            except queue.Empty:
+                break
+            if self.check_connection(connection):
+                self.reused_connection = True
+                return connection
+            connection.close()
+        self.reused_connection = False
+        return super().get_new_connection(conn_params)
+
+    @staticmethod
+    def check_connection(connection):
+        try:
+            connection.execute('SELECT 1').fetchone()
+        except Database.Error:
+            return False
+        return True
+
+    def is_usable(self):
+        return self.check_connection(self.connection)
+
+    def clear_pool(self):
+        """Close the pooled connections, e.g. before changing pragmas."""
+        while True:
+            try:
+                self.pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            try:
+                self.pool.put_nowait(self.connection)
+            except queue.Full:
+                self.connection.close()
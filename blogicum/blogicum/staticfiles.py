@@ -0,0 +1,59 @@
+"""
+Serving collected static files in production.
+Files are expected to be built by the build_static command: hashed by
+ManifestStaticFilesStorage and accompanied by .br/.gz variants.
+"""
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.functional import SimpleLazyObject
+
+# Suffix of a precompressed variant and its Content-Encoding, best first.
+ENCODINGS = (
+    ('.br', 'br'),
+    ('.gz', 'gzip'),
+)
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+hashed_names = SimpleLazyObject(
+    lambda: set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+)
+
+
+def accepted_encodings(request):
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    return {
+        coding.split(';')[0].strip() for coding in header.split(',')
+    }
+
+
+def serve(request, path):
+    fullpath = safe_join(settings.STATIC_ROOT, path)
+    if not os.path.isfile(fullpath):
+        raise Http404('Static file does not exist')
+
+    served, encoding = fullpath, None
+    accepted = accepted_encodings(request)
+    for suffix, candidate in ENCODINGS:
+        if candidate in accepted and os.path.isfile(fullpath + suffix):
+            served, encoding = fullpath + suffix, candidate
+            break
+
+    content_type, _ = mimetypes.guess_type(fullpath)
+    response = FileResponse(
+        open(served, 'rb'),
+        content_type=content_type or 'application/octet-stream',
+        filename=os.path.basename(fullpath),
+    )
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = (
+        IMMUTABLE if path in hashed_names else 'no-cache'
+    )
+    return response
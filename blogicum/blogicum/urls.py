@@ -2,7 +2,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
-from django.urls import include, path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
 from django.views.generic.edit import CreateView
 
 urlpatterns = [
@@ -39,6 +39,12 @@ urlpatterns = [
 
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
+if getattr(settings, 'SERVE_STATIC', False):
+    from blogicum.staticfiles import serve
+    urlpatterns += (
+        re_path(rf'^{settings.STATIC_URL.lstrip("/")}(?P<path>.*)$', serve),
+    )
+
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
 
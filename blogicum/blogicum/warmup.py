@@ -0,0 +1,29 @@
+"""Work done once per worker process before it serves requests."""
+import time
+
+from django.conf import settings
+from django.template import engines
+
+
+def iter_template_names():
+    for path in sorted(settings.TEMPLATES_DIR.rglob('*.html')):
+        yield path.relative_to(settings.TEMPLATES_DIR).as_posix()
+
+
+def warm_templates():
+    """
+    Compile every template under TEMPLATES_DIR.
+    With the cached loader the compiled templates stay in memory, so the
+    first request does not pay the parse cost. Yields (name, seconds).
+    """
+    engine = engines['django']
+    for name in iter_template_names():
+        started = time.perf_counter()
+        engine.get_template(name)
+        yield name, time.perf_counter() - started
+
+
+def warm_up():
+    if getattr(settings, 'WARM_UP_TEMPLATES', False):
+        for _ in warm_templates():
+            pass
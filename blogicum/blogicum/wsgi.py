@@ -3,6 +3,10 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from blogicum.warmup import warm_up
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_wsgi_application()
+
+warm_up()
@@ -0,0 +1,148 @@
+import re
+from pathlib import Path
+
+import django_bootstrap5
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SOURCE = 'css/bootstrap.min.css'
+BUNDLE = 'css/bootstrap.purged.css'
+CRITICAL_TEMPLATE = 'includes/critical_css.html'
+
+# Templates rendered above the fold on every page.
+CRITICAL_TEMPLATES = ('base.html', 'includes/header.html')
+
+# Classes django_bootstrap5 puts on form widgets from Python code, so they
+# never show up in a class="" attribute of a template.
+FORM_CLASSES = {
+    'alert', 'alert-dismissible', 'btn', 'btn-close', 'btn-primary', 'fade',
+    'form-check', 'form-check-inline', 'form-check-input',
+    'form-check-label', 'form-control', 'form-control-color', 'form-label',
+    'form-range', 'form-select', 'form-switch', 'has-validation',
+    'input-group', 'input-group-text', 'is-invalid', 'is-valid', 'mb-3',
+    'show', 'visually-hidden',
+}
+
+CLASS_ATTR = re.compile(r'class="([^"]*)"')
+TEMPLATE_TAG = re.compile(r'{%.*?%}|{{.*?}}')
+SELECTOR_CLASS = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+COMMENT = re.compile(r'/\*.*?\*/', re.S)
+KEYFRAMES = re.compile(r'@(?:-webkit-)?keyframes\s+([\w-]+)')
+
+
+def template_classes(paths):
+    classes = set()
+    for path in paths:
+        for value in CLASS_ATTR.findall(path.read_text(encoding='utf-8')):
+            classes.update(TEMPLATE_TAG.sub(' ', value).split())
+    return classes
+
+
+def split_blocks(css):
+    """Yield (prelude, body) per top-level block; body is None for @charset."""
+    depth = start = body_start = 0
+    quote = None
+    for i, char in enumerate(css):
+        if quote:
+            if char == quote and css[i - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            if depth == 0:
+                body_start = i
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                yield css[start:body_start].strip(), css[body_start + 1:i]
+                start = i + 1
+        elif char == ';' and depth == 0:
+            yield css[start:i].strip(), None
+            start = i + 1
+
+
+def split_selectors(prelude):
+    depth, start = 0, 0
+    for i, char in enumerate(prelude):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            yield prelude[start:i].strip()
+            start = i + 1
+    yield prelude[start:].strip()
+
+
+def purge(css, classes):
+    """Drop every selector that needs a class missing from `classes`."""
+    kept, keyframes = [], []
+    for prelude, body in split_blocks(css):
+        if body is None:
+            # @charset is written by the caller; it is invalid inline.
+            continue
+        if prelude.startswith(('@media', '@supports')):
+            inner, inner_keyframes = purge(body, classes)
+            keyframes.extend(inner_keyframes)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif KEYFRAMES.match(prelude):
+            keyframes.append((prelude, body))
+        elif prelude.startswith('@'):
+            kept.append(f'{prelude}{{{body}}}')
+        else:
+            selectors = [
+                selector for selector in split_selectors(prelude)
+                if set(SELECTOR_CLASS.findall(selector)) <= classes
+            ]
+            if selectors:
+                kept.append(f'{",".join(selectors)}{{{body}}}')
+    return ''.join(kept), keyframes
+
+
+def purge_stylesheet(css, classes):
+    css, keyframes = purge(COMMENT.sub('', css), classes)
+    for prelude, body in keyframes:
+        if KEYFRAMES.match(prelude).group(1) in css:
+            css += f'{prelude}{{{body}}}'
+    return css
+
+
+class Command(BaseCommand):
+    help = ('Builds a Bootstrap bundle that only has the classes used in '
+            'templates/ and inlines the above-the-fold part into base.html.')
+
+    def handle(self, *args, **options):
+        static_dir = Path(settings.STATICFILES_DIRS[0])
+        templates_dir = Path(settings.TEMPLATES_DIR)
+        bootstrap_templates = (
+            Path(django_bootstrap5.__file__).parent / 'templates'
+        )
+        source = (static_dir / SOURCE).read_text(encoding='utf-8')
+        header = (
+            '@charset "UTF-8";/*! Bootstrap v5.0.1 | MIT License | '
+            'purged by manage.py build_css */'
+        )
+
+        used = (
+            template_classes(templates_dir.rglob('*.html'))
+            | template_classes(bootstrap_templates.rglob('*.html'))
+            | FORM_CLASSES
+        )
+        bundle = header + purge_stylesheet(source, used)
+        (static_dir / BUNDLE).write_text(bundle, encoding='utf-8')
+
+        critical = purge_stylesheet(source, template_classes(
+            templates_dir / name for name in CRITICAL_TEMPLATES
+        ))
+        (templates_dir / CRITICAL_TEMPLATE).write_text(
+            '{# Generated by manage.py build_css, do not edit. #}\n'
+            f'<style>{{% verbatim %}}{critical}{{% endverbatim %}}</style>\n',
+            encoding='utf-8',
+        )
+
+        self.stdout.write(f'{SOURCE:<28} {len(source):>7} bytes')
+        self.stdout.write(f'{BUNDLE:<28} {len(bundle):>7} bytes '
+                          f'({len(used)} classes)')
+        self.stdout.write(f'{CRITICAL_TEMPLATE:<28} {len(critical):>7} bytes')
@@ -0,0 +1,79 @@
+import gzip
+import os
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.ico', '.txt', '.json', '.xml')
+
+# A variant is kept only if it saves at least this share of the file.
+MIN_SAVING = 0.05
+
+
+class Command(BaseCommand):
+    help = ('Collects static files with hashed names and writes '
+            'gzip and brotli variants next to the compressible ones.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-collect',
+            action='store_true',
+            help='Only compress what is already in STATIC_ROOT.',
+        )
+
+    def handle(self, *args, **options):
+        if not options['skip_collect']:
+            call_command('collectstatic', interactive=False, verbosity=0)
+        if brotli is None:
+            self.stderr.write(self.style.WARNING(
+                'Brotli is not installed, only gzip variants are built.'
+            ))
+
+        totals = {'original': 0, 'gzip': 0, 'br': 0}
+        for path in self.iter_compressible(settings.STATIC_ROOT):
+            with open(path, 'rb') as file:
+                data = file.read()
+            totals['original'] += len(data)
+            totals['gzip'] += self.write_variant(
+                path + '.gz', data, gzip.compress(data, 9, mtime=0))
+            if brotli is not None:
+                totals['br'] += self.write_variant(
+                    path + '.br', data, brotli.compress(data, quality=11))
+
+        self.report(totals)
+
+    @staticmethod
+    def iter_compressible(root):
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith(COMPRESSIBLE):
+                    yield os.path.join(dirpath, filename)
+
+    @staticmethod
+    def write_variant(path, data, compressed):
+        """Write a variant if it is worth it; return the size served."""
+        if len(compressed) > len(data) * (1 - MIN_SAVING):
+            if os.path.exists(path):
+                os.remove(path)
+            return len(data)
+        with open(path, 'wb') as file:
+            file.write(compressed)
+        return len(compressed)
+
+    def report(self, totals):
+        original = totals['original']
+        self.stdout.write(f'original  {original:>10} bytes')
+        for encoding in ('gzip', 'br'):
+            if encoding == 'br' and brotli is None:
+                continue
+            size = totals[encoding]
+            saving = 100 * (1 - size / original) if original else 0
+            self.stdout.write(
+                f'{encoding:<8}  {size:>10} bytes  (-{saving:.1f}%)'
+            )
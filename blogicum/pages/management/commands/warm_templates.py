@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blogicum.warmup import iter_template_names, warm_templates
+
+
+class Command(BaseCommand):
+    help = ('Compiles every template under templates/ and reports '
+            'how long each one took to load.')
+
+    def handle(self, *args, **options):
+        names = list(iter_template_names())
+        width = max(map(len, names), default=0)
+        total = 0
+        for name, seconds in warm_templates():
+            total += seconds
+            self.stdout.write(f'{name:<{width}}  {seconds * 1000:8.2f} ms')
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(names)} templates compiled in {total * 1000:.2f} ms'
+        ))
@@ -0,0 +1,80 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from blog.paginators import EstimatedCountPaginator, estimated_count
+
+
+@pytest.mark.django_db
+def test_post_changelist_queries_do_not_grow_with_rows(
+        admin_client, mixer, published_category, published_location):
+    mixer.cycle(20).blend(Post, category=published_category,
+                          location=published_location)
+    admin_client.get("/admin/blog/post/")
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get("/admin/blog/post/")
+    assert response.status_code == HTTPStatus.OK
+    assert len(context.captured_queries) < 10, (
+        "Убедитесь, что список постов в админке не делает запрос на "
+        "каждую строку."
+    )
+
+
+@pytest.mark.django_db
+def test_paginator_estimates_large_unfiltered_lists(settings, mixer):
+    mixer.cycle(3).blend(Post)
+    settings.ESTIMATED_COUNT_THRESHOLD = 1
+    assert EstimatedCountPaginator(Post.objects.all(), 10).count >= 3
+    filtered = Post.objects.filter(pk__in=[])
+    assert EstimatedCountPaginator(filtered, 10).count == 0
+
+
+@pytest.mark.django_db
+def test_paginator_clamps_pages_past_the_real_end(
+        settings, admin_client, mixer):
+    posts = mixer.cycle(5).blend(Post)
+    Post.objects.filter(pk__in=[post.pk for post in posts[:3]]).delete()
+    settings.ESTIMATED_COUNT_THRESHOLD = 1
+    estimate = estimated_count(Post)
+    assert estimate > 2
+
+    paginator = EstimatedCountPaginator(Post.objects.order_by("pk"), 1)
+    assert paginator.num_pages == estimate
+    page = paginator.page(4)
+    assert (page.number, paginator.count, paginator.num_pages) == (2, 2, 2), (
+        "Убедитесь, что страница за концом списка ведёт на последнюю "
+        "страницу с точным числом строк."
+    )
+    assert list(page.object_list) == [posts[4]]
+
+    response = admin_client.get("/admin/blog/post/")
+    assert f"~{estimate} " in response.content.decode(), (
+        "Убедитесь, что оценка числа постов в админке помечена знаком ~."
+    )
+
+
+@pytest.mark.django_db
+def test_category_change_page_lists_recent_posts_only(
+        admin_client, mixer, published_category):
+    mixer.cycle(15).blend(Post, category=published_category)
+    response = admin_client.get(
+        f"/admin/blog/category/{published_category.id}/change/")
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode()
+    assert "TOTAL_FORMS" not in content, (
+        "Убедитесь, что страница категории в админке не выводит форму "
+        "для каждого поста."
+    )
+    assert len(re.findall(r"/admin/blog/post/\d+/change/", content)) == 10
+    assert f"/admin/blog/post/?category__id__exact={published_category.id}" \
+        in content
+
+
+@pytest.mark.django_db
+def test_post_form_uses_autocomplete(admin_client):
+    content = admin_client.get("/admin/blog/post/add/").content.decode()
+    assert "admin-autocomplete" in content
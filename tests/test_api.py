@@ -0,0 +1,95 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.fixture
+def visible_posts(mixer, user, published_category):
+    now = timezone.now()
+    return mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+        pub_date=(now - timedelta(hours=hours) for hours in range(1, 6)),
+    )
+
+
+@pytest.mark.django_db
+def test_api_cursor_walks_visible_feed(
+        client, mixer, user, published_category, visible_posts):
+    mixer.blend("blog.Post", author=user, category=published_category,
+                is_published=False)
+    seen, url = [], "/api/posts/?limit=2"
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        seen += [post["id"] for post in data["results"]]
+        url = data["next_cursor"] and (
+            f"/api/posts/?limit=2&cursor={data['next_cursor']}"
+        )
+    assert seen == [post.id for post in visible_posts], (
+        "Убедитесь, что курсорная пагинация API проходит по всем видимым "
+        "постам ровно один раз и в порядке ленты."
+    )
+
+
+@pytest.mark.django_db
+def test_api_sparse_fields_shrink_select(client, visible_posts):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/posts/?fields=id,title")
+    assert set(response.json()["results"][0]) == {"id", "title"}
+    sql = queries.captured_queries[-1]["sql"]
+    assert '"text"' not in sql and "JOIN" not in sql, (
+        "Убедитесь, что `?fields=` сокращает список выбираемых колонок."
+    )
+    response = client.get("/api/posts/?fields=id,secret")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_api_streams_comments_of_visible_post(
+        client, mixer, user, visible_posts):
+    comments = mixer.cycle(3).blend(
+        "blog.Comment", post=visible_posts[0], author=user
+    )
+    response = client.get(f"/api/posts/{visible_posts[0].id}/comments/")
+    assert response.streaming
+    data = json.loads(b"".join(response.streaming_content))
+    assert [comment["id"] for comment in data] == [c.id for c in comments]
+
+    post = visible_posts[1]
+    post.is_published = False
+    post.save()
+    response = client.get(f"/api/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    response = client.get(f"/api/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_api_batch_uses_one_query_and_post_cache(
+        client, django_assert_max_num_queries, mixer, user, visible_posts):
+    ids = [post.id for post in visible_posts[:3]] + [0]
+    url = "/api/posts/batch/?ids=" + ",".join(map(str, ids))
+    with django_assert_max_num_queries(1):
+        data = client.get(url).json()
+    assert [post["id"] for post in data["results"]] == ids[:3]
+    assert data["missing"] == [0]
+
+    with django_assert_max_num_queries(0):
+        client.get(url)
+
+    mixer.blend("blog.Comment", post=visible_posts[0], author=user)
+    data = client.get(url).json()
+    assert data["results"][0]["comment_count"] == 1, (
+        "Убедитесь, что кеш поста сбрасывается при изменении его комментариев."
+    )
+
+    response = client.get("/api/posts/batch/?ids=" + ",".join(
+        map(str, range(1, 102))))
+    assert response.status_code == HTTPStatus.BAD_REQUEST
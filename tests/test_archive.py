@@ -0,0 +1,71 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone as tz
+
+from blog.models import ArchivedPost, Post
+
+
+@pytest.mark.django_db
+def test_old_posts_move_to_archive(client, comment):
+    post = comment.post
+    pub_date = tz.now() - timedelta(days=1000)
+    Post.objects.filter(pk=post.pk).update(pub_date=pub_date)
+    call_command("archive_posts", horizon_days=365)
+
+    assert not Post.objects.filter(pk=post.pk).exists(), (
+        "Убедитесь, что старая публикация удаляется из таблицы постов "
+        "при переносе в архив."
+    )
+    archived = ArchivedPost.objects.get(pk=post.pk)
+    assert archived.comments[0]["text"] == comment.text, (
+        "Убедитесь, что комментарии переносятся в архив вместе с постом."
+    )
+
+    local = tz.localtime(pub_date)
+    response = client.get(f"/archive/{local.year}/{local.month}/")
+    assert response.status_code == HTTPStatus.OK
+    assert post.title in response.content.decode(), (
+        "Убедитесь, что страница месяца в архиве показывает публикацию."
+    )
+    assert f"/archive/{local.year}/{local.month}/" in (
+        client.get("/archive/").content.decode()
+    )
+
+    response = client.get(f"/posts/{post.pk}/")
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что публикация из архива открывается по старому адресу."
+    )
+    assert comment.text.splitlines()[0] in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_archive_keeps_recent_posts(post_with_published_location):
+    Post.objects.filter(pk=post_with_published_location.pk).update(
+        pub_date=tz.now() - timedelta(days=1))
+    call_command("archive_posts", horizon_days=365)
+    assert Post.objects.filter(pk=post_with_published_location.pk).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/archive/", "/archive/{year}/{month}/"])
+def test_archive_pages_are_not_shared_between_users(
+        mixer, client, another_user, another_user_client, user,
+        published_category, url):
+    pub_date = tz.now() - timedelta(days=1000)
+    mixer.blend(Post, author=user, category=published_category,
+                is_published=True, pub_date=pub_date)
+    call_command("archive_posts", horizon_days=365)
+    local = tz.localtime(pub_date)
+    url = url.format(year=local.year, month=local.month)
+
+    content = another_user_client.get(url).content.decode()
+    assert another_user.username in content
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert another_user.username not in response.content.decode(), (
+        "Убедитесь, что страницы архива с шапкой пользователя не "
+        "кешируются целиком для всех посетителей."
+    )
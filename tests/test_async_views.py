@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from django.utils import timezone
+
+from blog import async_views, feeds
+from blog.views import IndexListView
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("view", [
+    IndexListView.as_view(),
+    feeds.cached_feed(feeds.PostsFeed()),
+])
+def test_async_variant_renders_in_thread_pool(
+        view, mixer, user, published_category):
+    post = mixer.blend("blog.Post", author=user, category=published_category,
+                       is_published=True,
+                       pub_date=timezone.now() - timedelta(days=1))
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    request.session = {}
+
+    response = async_to_sync(async_views.in_thread_pool(view))(request)
+    assert post.title in response.content.decode(), (
+        "Убедитесь, что асинхронный вариант страницы выполняет запросы к "
+        "базе и рендеринг в пуле потоков и возвращает готовый ответ."
+    )
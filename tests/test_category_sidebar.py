@@ -0,0 +1,65 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import CategoryCount, Post
+from blog.sidebar import render_sidebar
+
+
+@pytest.mark.django_db
+def test_counts_follow_post_visibility(post_with_published_location):
+    post = post_with_published_location
+    category = post.category
+    assert CategoryCount.objects.get(category=category).posts == int(
+        post.visible)
+
+    post.is_published = not post.is_published
+    post.save()
+    assert CategoryCount.objects.get(category=category).posts == int(
+        post.visible), (
+        "Убедитесь, что число публикаций в категории пересчитывается "
+        "при снятии и возврате публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_sidebar_is_cached(mixer, published_category, user):
+    mixer.cycle(3).blend(Post, category=published_category, author=user,
+                         is_published=True, pub_date="2020-01-01T00:00Z")
+    html = render_sidebar()
+    assert f"{published_category.title} (3)" in html, (
+        "Убедитесь, что блок категорий показывает число публикаций."
+    )
+    with CaptureQueriesContext(connection) as queries:
+        assert render_sidebar() == html
+    assert not queries.captured_queries, (
+        "Убедитесь, что блок категорий берётся из кеша без запросов к БД."
+    )
+
+    published_category.is_published = False
+    published_category.save()
+    assert published_category.title not in render_sidebar()
+
+
+@pytest.mark.django_db
+def test_moved_post_updates_counts_without_recount(
+        mixer, published_category, user):
+    other = mixer.blend("blog.Category", is_published=True)
+    post = mixer.blend(Post, category=published_category, author=user,
+                       is_published=True, pub_date="2020-01-01T00:00Z")
+    post.category = other
+    with CaptureQueriesContext(connection) as queries:
+        post.save()
+    counts = dict(CategoryCount.objects.values_list("category", "posts"))
+    assert counts == {published_category.pk: 0, other.pk: 1}, (
+        "Убедитесь, что при переносе публикации меняются счётчики обеих "
+        "категорий."
+    )
+    assert not [q for q in queries.captured_queries
+                if "GROUP BY" in q["sql"]], (
+        "Убедитесь, что сохранение публикации меняет счётчики на единицу "
+        "без пересчёта категории."
+    )
+
+    post.delete()
+    assert CategoryCount.objects.get(category=other).posts == 0
@@ -0,0 +1,24 @@
+from django.core.cache import cache
+
+from blog import versions
+
+
+def test_untouched_scope_mark_expires(monkeypatch):
+    cache.clear()
+    timeouts = {}
+    add = cache.add
+
+    def spy(key, value, timeout=None, **kwargs):
+        timeouts[key] = timeout
+        return add(key, value, timeout=timeout, **kwargs)
+
+    monkeypatch.setattr(cache, "add", spy)
+    first = versions.marks(versions.post_scope(1))
+    assert versions.marks(versions.post_scope(1)) == first
+    assert timeouts == {
+        "blog:changed:post:1": versions.UNTOUCHED_TIMEOUT
+    }, (
+        "Убедитесь, что метки нетронутых областей хранятся в кэше "
+        "ограниченное время."
+    )
+
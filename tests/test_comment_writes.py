@@ -0,0 +1,123 @@
+import threading
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from blog import comment_buffer
+from blog.models import Comment, Post
+
+
+@pytest.fixture
+def visible_post(mixer, user, published_category):
+    return mixer.blend("blog.Post", author=user, category=published_category,
+                       is_published=True,
+                       pub_date=timezone.now() - timedelta(days=1))
+
+
+@pytest.mark.django_db
+@override_settings(COMMENT_RATE_LIMITS={"user": (2, 60), "post": (100, 60)})
+def test_comment_rate_limit_per_user(user_client, visible_post):
+    cache.clear()
+    url = f"/posts/{visible_post.id}/comment/"
+    for _ in range(2):
+        user_client.post(url, {"text": "Комментарий"})
+    response = user_client.post(url, {"text": "Лишний комментарий"})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+        "Убедитесь, что при превышении лимита комментариев возвращается "
+        "статус 429."
+    )
+    assert int(response["Retry-After"]) > 0
+    assert Comment.objects.count() == 2
+
+
+@pytest.mark.django_db
+@override_settings(COMMENT_RATE_LIMITS={"user": (1, 60), "post": (100, 60)})
+def test_rejected_comment_is_not_counted(user_client, visible_post):
+    cache.clear()
+    url = f"/posts/{visible_post.id}/comment/"
+    user_client.post(url, {"text": ""})
+    user_client.post(f"/posts/{visible_post.id + 1}/comment/",
+                     {"text": "Комментарий к несуществующему посту"})
+    response = user_client.post(url, {"text": "Комментарий"})
+    assert response.status_code == HTTPStatus.FOUND, (
+        "Убедитесь, что в лимит комментариев засчитываются только "
+        "принятые комментарии."
+    )
+    assert Comment.objects.count() == 1
+
+
+@pytest.mark.django_db
+@override_settings(COMMENT_BUFFER=True, COMMENT_BUFFER_DELAY=3600)
+def test_buffered_comments_are_inserted_in_one_batch(
+        monkeypatch, user_client, visible_post):
+    cache.clear()
+    buffer = comment_buffer.CommentBuffer()
+    monkeypatch.setattr(comment_buffer, "buffer", buffer)
+    updated_at = visible_post.updated_at
+    url = f"/posts/{visible_post.id}/comment/"
+    for i in range(3):
+        user_client.post(url, {"text": f"Комментарий {i}"})
+    assert not Comment.objects.exists()
+
+    with CaptureQueriesContext(connection) as queries:
+        assert buffer.flush() == 3
+    inserts = [q for q in queries.captured_queries
+               if q["sql"].startswith('INSERT INTO "blog_comment"')]
+    assert len(inserts) == 1, (
+        "Убедитесь, что буферизованные комментарии записываются одним "
+        "запросом INSERT."
+    )
+    assert Comment.objects.filter(post=visible_post).count() == 3
+    assert Post.objects.get(pk=visible_post.pk).updated_at > updated_at
+
+
+@override_settings(COMMENT_BUFFER_DELAY=3600)
+def test_failed_flush_requeues_comments(monkeypatch):
+    buffer = comment_buffer.CommentBuffer()
+    buffer._thread = object()  # No background flushes in this test.
+    comments = [Comment(text=f"Комментарий {i}") for i in range(2)]
+    for comment in comments:
+        buffer.add(comment)
+
+    def fail(batch):
+        raise DatabaseError("database is locked")
+
+    monkeypatch.setattr(comment_buffer, "write_comments", fail)
+    with pytest.raises(DatabaseError):
+        buffer.flush()
+    written = []
+    monkeypatch.setattr(comment_buffer, "write_comments",
+                        lambda batch: written.extend(batch) or len(batch))
+    assert buffer.flush() == 2, (
+        "Убедитесь, что комментарии, которые не удалось записать, "
+        "возвращаются в очередь и записываются при следующем сбросе."
+    )
+    assert written == comments
+
+
+@override_settings(COMMENT_BUFFER_DELAY=0.01)
+def test_buffer_thread_survives_failed_write(monkeypatch):
+    buffer = comment_buffer.CommentBuffer()
+    written = threading.Event()
+    calls = []
+
+    def write(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise DatabaseError("database is locked")
+        written.set()
+        return len(batch)
+
+    monkeypatch.setattr(comment_buffer, "write_comments", write)
+    buffer.add(Comment(text="Комментарий"))
+    assert written.wait(5), (
+        "Убедитесь, что фоновый поток буфера продолжает работу после "
+        "ошибки записи."
+    )
+    assert calls[:2] == [1, 1]
+    assert buffer._thread.is_alive()
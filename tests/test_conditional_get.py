@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/", "/profile/{username}/"])
+def test_repeated_request_gets_not_modified(
+        url, mixer, user, published_category, user_client):
+    mixer.blend("blog.Post", author=user, category=published_category)
+    url = url.format(username=user.username)
+
+    response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.has_header("ETag")
+    assert response.has_header("Last-Modified")
+
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что при совпадении ETag страница не отрисовывается "
+        "повторно, а возвращается статус 304."
+    )
+
+
+@pytest.mark.django_db
+def test_new_comment_changes_post_etag(
+        post_with_published_location, user, user_client, mixer):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = user_client.get(url)["ETag"]
+
+    mixer.blend("blog.Comment", post=post_with_published_location,
+                author=user)
+
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_hidden_post_is_not_validated(
+        post_with_published_location, another_user_client):
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    response = another_user_client.get(
+        f"/posts/{post_with_published_location.id}/", HTTP_IF_NONE_MATCH="*"
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_feed_not_modified_without_post_queries(
+        post_with_published_location, user_client):
+    etag = user_client.get("/")["ETag"]
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not [
+        query for query in context.captured_queries
+        if "blog_post" in query["sql"]
+    ], (
+        "Убедитесь, что валидаторы ленты не обращаются к таблице постов."
+    )
+
+
+@pytest.mark.django_db
+def test_new_comment_changes_feed_etag(
+        post_with_published_location, user, user_client, mixer):
+    etag = user_client.get("/")["ETag"]
+
+    mixer.blend("blog.Comment", post=post_with_published_location,
+                author=user)
+
+    response = user_client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что новый комментарий меняет ETag ленты: "
+        "в карточке поста показано число комментариев."
+    )
+
+
+@pytest.mark.django_db
+def test_new_post_elsewhere_changes_detail_etag(
+        post_with_published_location, mixer, user, user_client):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = user_client.get(url)["ETag"]
+
+    mixer.blend("blog.Post", author=user,
+                category=post_with_published_location.category,
+                is_published=True, pub_date="2020-01-01T00:00Z")
+
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что страница поста обновляется, когда меняются "
+        "счётчики публикаций в боковой панели категорий."
+    )
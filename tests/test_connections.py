@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+
+from blog import connections
+from blogicum.sqlite_pool.base import DatabaseWrapper
+
+
+@pytest.fixture
+def make_wrapper(tmp_path):
+    settings_dict = {
+        **connection.settings_dict,
+        "ENGINE": "blogicum.sqlite_pool",
+        "NAME": str(tmp_path / "db.sqlite3"),
+        "OPTIONS": {"pool_size": 1},
+    }
+    wrappers = []
+
+    def make():
+        wrappers.append(DatabaseWrapper(settings_dict, alias="pooled"))
+        return wrappers[-1]
+
+    yield make
+    for wrapper in wrappers:
+        wrapper.close()
+    DatabaseWrapper._pools.clear()
+
+
+@pytest.mark.django_db
+def test_closed_connection_is_reused(make_wrapper):
+    before = connections.stats.snapshot()
+    first = make_wrapper()
+    first.ensure_connection()
+    raw = first.connection
+    first.close()
+
+    second = make_wrapper()
+    second.ensure_connection()
+    assert second.connection is raw and second.reused_connection, (
+        "Убедитесь, что закрытое соединение возвращается в пул "
+        "и выдаётся следующему потоку."
+    )
+    after = connections.stats.snapshot()
+    assert after["opened"] - before["opened"] == 1
+    assert after["reused"] - before["reused"] == 1
+
+
+@pytest.mark.django_db
+def test_broken_pooled_connection_is_replaced(make_wrapper):
+    first = make_wrapper()
+    first.ensure_connection()
+    raw = first.connection
+    first.close()
+    raw.close()
+
+    second = make_wrapper()
+    second.ensure_connection()
+    assert second.connection is not raw
+    assert not second.reused_connection
+    assert second.is_usable()
@@ -0,0 +1,166 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import deletion
+from blog.models import Comment, PendingDeletion, Post, UserStats
+
+User = get_user_model()
+
+
+@pytest.fixture
+def post_with_comments(mixer, user, published_category):
+    post = mixer.blend(Post, author=user, category=published_category,
+                       is_published=True, pub_date="2020-01-01T00:00Z")
+    mixer.cycle(5).blend(Comment, post=post)
+    return post
+
+
+@pytest.mark.django_db
+def test_large_post_is_hidden_then_reaped(settings, user_client,
+                                          post_with_comments):
+    settings.DELETE_SYNC_LIMIT = 2
+    post = post_with_comments
+    response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == HTTPStatus.FOUND
+    assert PendingDeletion.objects.filter(post=post).exists(), (
+        "Убедитесь, что пост с большим числом комментариев удаляется "
+        "в фоне."
+    )
+    assert user_client.get(f"/posts/{post.id}/").status_code == (
+        HTTPStatus.NOT_FOUND
+    ), "Убедитесь, что пост скрыт сразу после запроса на удаление."
+
+    call_command("reap_deletions", batch_size=2, pause=0)
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert not Comment.objects.filter(post_id=post.pk).exists()
+    assert not PendingDeletion.objects.exists()
+
+
+@pytest.mark.django_db
+def test_small_post_is_deleted_at_once(user_client, post_with_comments):
+    post = post_with_comments
+    user_client.post(f"/posts/{post.id}/delete/")
+    assert not Post.objects.filter(pk=post.pk).exists()
+
+
+@pytest.mark.django_db
+def test_large_user_is_hidden_then_reaped(settings, client, user,
+                                          post_with_comments):
+    settings.DELETE_SYNC_LIMIT = 2
+    assert deletion.delete_user(user)
+    assert client.get(f"/profile/{user.username}/").status_code == (
+        HTTPStatus.NOT_FOUND
+    ), "Убедитесь, что профиль скрыт сразу после запроса на удаление."
+    assert not Post.objects.published().filter(author=user).exists()
+
+    call_command("reap_deletions", pause=0)
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert not Post.objects.filter(author_id=user.pk).exists()
+
+
+@pytest.mark.django_db
+def test_post_waiting_for_deletion_takes_no_comments(
+        settings, user_client, post_with_comments):
+    settings.DELETE_SYNC_LIMIT = 2
+    post = post_with_comments
+    assert deletion.delete_post(post)
+    response = user_client.post(f"/posts/{post.id}/comment/",
+                                {"text": "Комментарий"})
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что к посту, ожидающему удаления, нельзя добавить "
+        "комментарий."
+    )
+    stream = user_client.get(f"/posts/{post.id}/comments/stream/")
+    assert stream.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_reap_skips_tombstones_gone_with_their_user(
+        settings, user, post_with_comments):
+    settings.DELETE_SYNC_LIMIT = 2
+    assert deletion.delete_user(user)
+    PendingDeletion.objects.create(post=post_with_comments)
+    reaped = list(deletion.reap(batch_size=2))
+    assert {tombstone.user_id for tombstone, _ in reaped} == {user.pk}, (
+        "Убедитесь, что удаление не обрабатывает отметки, удалённые "
+        "вместе с пользователем."
+    )
+    assert all(rows for _, rows in reaped)
+    assert not PendingDeletion.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", [
+    "/admin/blog/post/{post.id}/delete/",
+    "/admin/auth/user/{post.author_id}/delete/",
+])
+def test_admin_confirms_large_deletion_with_counts(
+        settings, admin_client, post_with_comments, url):
+    settings.DELETE_SYNC_LIMIT = 2
+    post = post_with_comments
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get(url.format(post=post))
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode()
+    assert "Комментарии: 5" in content, (
+        "Убедитесь, что страница подтверждения удаления показывает число "
+        "комментариев, если их больше DELETE_SYNC_LIMIT."
+    )
+    assert not [
+        query for query in context.captured_queries
+        if query["sql"].startswith('SELECT "blog_comment"."id"')
+    ], (
+        "Убедитесь, что страница подтверждения удаления не загружает "
+        "все комментарии."
+    )
+
+
+@pytest.mark.django_db
+def test_reaper_updates_stats_once_per_batch(
+        mixer, user, another_user, published_category):
+    post = mixer.blend(Post, author=user, category=published_category,
+                       is_published=True, pub_date="2020-01-01T00:00Z")
+    mixer.cycle(20).blend(Comment, post=post, author=another_user)
+    PendingDeletion.objects.create(post=post)
+    with CaptureQueriesContext(connection) as context:
+        list(deletion.reap(batch_size=10))
+    updates = [
+        query["sql"] for query in context.captured_queries
+        if query["sql"].startswith(('UPDATE "blog_userstats"',
+                                    'UPDATE "blog_post"'))
+    ]
+    # Two batches of comments, then the post's own stats.
+    assert len(updates) <= 2 * 2 + 1, (
+        "Убедитесь, что удаление комментариев пачкой обновляет "
+        "статистику и пост один раз на пачку, а не на каждый комментарий."
+    )
+    assert not Comment.objects.exists()
+    assert UserStats.objects.get(user=user).comments_received == 0
+
+
+@pytest.mark.django_db
+def test_comments_of_deferred_user_are_hidden_at_once(
+        settings, client, mixer, user, another_user, published_category,
+        post_with_comments):
+    settings.DELETE_SYNC_LIMIT = 2
+    other_post = mixer.blend(Post, author=another_user,
+                             category=published_category, is_published=True,
+                             pub_date="2020-01-01T00:00Z")
+    comment = mixer.blend(Comment, post=other_post, author=user,
+                          text="Комментарий удаляемого автора")
+    assert deletion.delete_user(user)
+
+    detail = client.get(f"/posts/{other_post.id}/").content.decode()
+    assert comment.text not in detail, (
+        "Убедитесь, что комментарии пользователя, ожидающего удаления, "
+        "сразу скрываются со страниц постов."
+    )
+    api = client.get(f"/api/posts/{other_post.id}/comments/")
+    assert comment.text not in b"".join(api.streaming_content).decode()
+    stream = client.get(f"/posts/{other_post.id}/comments/stream/")
+    assert comment.text not in stream.content.decode()
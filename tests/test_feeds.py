@@ -0,0 +1,45 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", [
+    "/feeds/rss/",
+    "/feeds/atom/",
+    "/category/{category}/rss/",
+    "/category/{category}/atom/",
+    "/profile/{username}/rss/",
+    "/profile/{username}/atom/",
+])
+def test_feed_lists_published_posts(
+        url, client, mixer, user, published_category):
+    post = mixer.blend("blog.Post", author=user, category=published_category,
+                       is_published=True,
+                       pub_date=timezone.now() - timedelta(days=1))
+    hidden = mixer.blend("blog.Post", author=user,
+                         category=published_category, is_published=False)
+    url = url.format(category=published_category.slug,
+                     username=user.username)
+
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode()
+    assert post.title in content
+    assert hidden.title not in content
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_publish_invalidates_feed(client, mixer, user, published_category):
+    etag = client.get("/feeds/rss/")["ETag"]
+    post = mixer.blend("blog.Post", author=user, category=published_category,
+                       is_published=True,
+                       pub_date=timezone.now() - timedelta(days=1))
+    response = client.get("/feeds/rss/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert post.title in response.content.decode()
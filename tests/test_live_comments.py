@@ -0,0 +1,98 @@
+import threading
+import time
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from django.utils import timezone
+
+from blog import async_views, live
+from blog.models import Comment
+
+
+@pytest.fixture(autouse=True)
+def broker(monkeypatch):
+    monkeypatch.setattr(live, "broker", live.Broker())
+
+
+@pytest.fixture
+def visible_post(mixer, user, published_category):
+    return mixer.blend("blog.Post", author=user, category=published_category,
+                       is_published=True,
+                       pub_date=timezone.now() - timedelta(days=1))
+
+
+@pytest.mark.django_db
+def test_new_comment_is_published_after_commit(
+        django_capture_on_commit_callbacks, mixer, user, visible_post):
+    with django_capture_on_commit_callbacks(execute=True):
+        comment = mixer.blend("blog.Comment", post=visible_post, author=user)
+    events = live.broker._since(visible_post.id, 0)
+    assert [event_id for event_id, _ in events] == [comment.id]
+    assert f'name="comment_{comment.id}"' in events[0][1], (
+        "Убедитесь, что новый комментарий отправляется подписчикам "
+        "отрендеренным шаблоном `includes/comment.html`."
+    )
+
+
+@pytest.mark.django_db
+def test_sync_stream_catches_up_without_waiting(
+        monkeypatch, client, mixer, user, visible_post):
+    monkeypatch.setattr(live, "STREAM_TIMEOUT", 5)
+    comment = mixer.blend("blog.Comment", post=visible_post, author=user)
+    url = f"/posts/{visible_post.id}/comments/stream/"
+
+    response = client.get(url, {"after": 0})
+    assert response["Content-Type"] == "text/event-stream"
+    assert f"id: {comment.id}\n" in response.content.decode()
+
+    started = time.monotonic()
+    response = client.get(url, HTTP_LAST_EVENT_ID=str(comment.id))
+    assert time.monotonic() - started < 1, (
+        "Убедитесь, что синхронный поток не занимает поток сервера "
+        "ожиданием новых комментариев."
+    )
+    assert "no new comments" in response.content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_stream_waits_for_push(monkeypatch, mixer, user, visible_post):
+    monkeypatch.setattr(live, "STREAM_TIMEOUT", 5)
+    comment = mixer.blend("blog.Comment", post=visible_post, author=user)
+    request = RequestFactory().get(
+        "/", HTTP_LAST_EVENT_ID=str(comment.id))
+    request.user = AnonymousUser()
+
+    pushed = Comment(id=comment.id + 100, post=visible_post, author=user,
+                     text="Живой комментарий", created_at=timezone.now())
+    threading.Timer(0.1, live.publish_comment, [pushed]).start()
+    response = async_to_sync(async_views.comment_stream)(
+        request, visible_post.id)
+    content = response.content.decode()
+    assert f"id: {pushed.id}\n" in content and pushed.text in content, (
+        "Убедитесь, что открытый поток получает новый комментарий "
+        "без перезагрузки страницы."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("async_views_on", (False, True))
+def test_page_opens_stream_only_with_async_views(
+        settings, client, visible_post, async_views_on):
+    settings.ASYNC_VIEWS = async_views_on
+    content = client.get(f"/posts/{visible_post.id}/").content.decode()
+    assert ("new EventSource" in content) is async_views_on, (
+        "Убедитесь, что страница поста открывает поток комментариев "
+        "только при включённом ASYNC_VIEWS."
+    )
+
+
+@pytest.mark.django_db
+def test_stream_of_hidden_post_is_not_found(client, visible_post):
+    visible_post.is_published = False
+    visible_post.save()
+    response = client.get(f"/posts/{visible_post.id}/comments/stream/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
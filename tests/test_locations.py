@@ -0,0 +1,52 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone as tz
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_location_posts_keyset_pages(client, mixer, user, published_location,
+                                     published_category):
+    now = tz.now()
+    for i in range(12):
+        mixer.blend(Post, author=user, location=published_location,
+                    category=published_category, is_published=True,
+                    pub_date=now - timedelta(days=i + 1), title=f"Пост {i}")
+    url = f"/location/{published_location.id}/"
+
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    posts = response.context["posts"]
+    assert [post.title for post in posts] == [f"Пост {i}" for i in range(10)]
+    assert published_location.name in response.content.decode()
+
+    response = client.get(url, {"after": response.context["next_cursor"]})
+    assert [post.title for post in response.context["posts"]] == [
+        "Пост 10", "Пост 11"], (
+        "Убедитесь, что следующая страница начинается после курсора."
+    )
+    assert response.context["next_cursor"] is None
+
+    assert client.get(url, {"after": "плохой"}).status_code == (
+        HTTPStatus.BAD_REQUEST)
+
+
+@pytest.mark.django_db
+def test_unpublished_location_is_not_found(client, mixer):
+    location = mixer.blend("blog.Location", is_published=False)
+    response = client.get(f"/location/{location.id}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_post_card_links_to_location(client, post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=tz.now() - timedelta(days=1), visible=True)
+    response = client.get("/")
+    assert f"/location/{post.location_id}/" in response.content.decode(), (
+        "Убедитесь, что место на карточке поста ведёт на страницу места."
+    )
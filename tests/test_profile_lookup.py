@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import users
+
+
+@pytest.mark.django_db
+def test_profile_reads_author_by_id(
+        client, user, post_with_published_location):
+    url = f"/profile/{user.username}/"
+    client.get(url)
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    sql = [query["sql"] for query in context.captured_queries]
+    assert not any('WHERE "auth_user"."username"' in query
+                   for query in sql), (
+        "Убедитесь, что страница профиля не ищет пользователя по имени, "
+        "когда его id уже в кеше."
+    )
+
+
+@pytest.mark.django_db
+def test_renamed_user_is_found_by_new_name(user_client, user):
+    old_username = user.username
+    assert users.user_id(old_username) == user.pk
+    response = user_client.post("/profile_edit/", {
+        "username": "renamed",
+        "first_name": "Имя",
+        "last_name": "Фамилия",
+        "email": "renamed@example.com",
+    })
+    assert response.status_code == HTTPStatus.FOUND
+    assert user_client.get("/profile/renamed/").status_code == HTTPStatus.OK
+    assert user_client.get(f"/profile/{old_username}/").status_code == (
+        HTTPStatus.NOT_FOUND
+    ), "Убедитесь, что старое имя пользователя больше не открывает профиль."
+
+
+@pytest.mark.django_db
+def test_new_user_replaces_cached_miss(client, mixer):
+    assert client.get("/profile/newcomer/").status_code == (
+        HTTPStatus.NOT_FOUND)
+    mixer.blend("auth.User", username="newcomer")
+    assert client.get("/profile/newcomer/").status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_missing_username_is_cached_briefly(monkeypatch, user):
+    cache.clear()
+    timeouts = {}
+    set_ = cache.set
+
+    def spy(key, value, timeout=None, **kwargs):
+        timeouts[key] = timeout
+        return set_(key, value, timeout, **kwargs)
+
+    monkeypatch.setattr(cache, "set", spy)
+    assert users.user_id("nobody") is None
+    assert users.user_id(user.username) == user.pk
+    assert timeouts == {
+        "blog:user_id:nobody": users.MISS_TIMEOUT,
+        f"blog:user_id:{user.username}": users.CACHE_TIMEOUT,
+    }, (
+        "Убедитесь, что отсутствие пользователя кешируется ненадолго."
+    )
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.models import Post
+from blogicum import routers
+
+
+@pytest.fixture(autouse=True)
+def with_replica(monkeypatch):
+    monkeypatch.setattr(routers, "has_replica", lambda: True)
+
+
+@pytest.fixture
+def router():
+    return routers.ReplicaRouter()
+
+
+def make_request(method="get", session=None):
+    request = getattr(RequestFactory(), method)("/")
+    request.session = session if session is not None else {}
+    return request
+
+
+def test_listing_reads_from_replica_unless_session_wrote(router):
+    @routers.read_from_replica
+    def view(request):
+        return HttpResponse(router.db_for_read(Post) or "default")
+
+    assert view(make_request()).content == b"replica", (
+        "Убедитесь, что страницы только для чтения читают из реплики."
+    )
+    assert router.db_for_read(Post) is None
+    assert router.db_for_write(Post) == "default"
+
+    sticky = {routers.STICKY_SESSION_KEY: time.time() + 30}
+    assert view(make_request(session=sticky)).content == b"default", (
+        "Убедитесь, что после записи сессия читает из основной базы."
+    )
+
+
+def test_write_makes_session_sticky():
+    middleware = routers.StickyPrimaryMiddleware(lambda r: HttpResponse())
+    session = {}
+    middleware(make_request("get", session))
+    assert not routers.is_sticky(make_request(session=session))
+    middleware(make_request("post", session))
+    assert routers.is_sticky(make_request(session=session))
+
+
+def test_sticky_middleware_is_async_capable():
+    async def get_response(request):
+        return HttpResponse()
+
+    middleware = routers.StickyPrimaryMiddleware(get_response)
+    assert asyncio.iscoroutinefunction(middleware), (
+        "Убедитесь, что StickyPrimaryMiddleware поддерживает асинхронный "
+        "стек middleware."
+    )
+    session = {}
+    async_to_sync(middleware)(make_request("post", session))
+    assert routers.is_sticky(make_request(session=session))
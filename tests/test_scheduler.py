@@ -0,0 +1,83 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import scheduler
+from blog.models import Post, PostQuerySet
+
+
+@pytest.mark.django_db
+def test_post_visibility_follows_schedule(
+        mixer, user, published_category, user_client, another_user_client):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    assert not post.visible, (
+        "Убедитесь, что отложенная публикация не видна читателям "
+        "до наступления даты публикации."
+    )
+    assert post not in Post.objects.published()
+
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    assert post not in Post.objects.published()
+
+    call_command("publish_scheduled")
+    post.refresh_from_db()
+    assert post.visible, (
+        "Убедитесь, что команда `publish_scheduled` публикует посты, "
+        "дата публикации которых наступила."
+    )
+    response = another_user_client.get(f"/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_unpublished_post_is_not_scheduled(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=False,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    call_command("publish_scheduled")
+    post.refresh_from_db()
+    assert not post.visible
+
+
+@pytest.mark.django_db
+def test_post_unpublished_while_scheduling_stays_hidden(
+        monkeypatch, mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1))
+    due = PostQuerySet.due
+    calls = []
+
+    def unpublish_after_select(self, now=None):
+        if calls:
+            # The author unpublishes between the SELECT and the UPDATE.
+            Post.objects.filter(pk=post.pk).update(is_published=False)
+        calls.append(now)
+        return due(self, now)
+
+    monkeypatch.setattr(PostQuerySet, "due", unpublish_after_select)
+    assert scheduler.publish_due_posts() == [post.pk]
+    post.refresh_from_db()
+    assert not post.visible, (
+        "Убедитесь, что пост, снятый с публикации во время работы "
+        "планировщика, не становится видимым."
+    )
@@ -0,0 +1,38 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_sitemap_index_points_to_post_chunks(
+        client, post_with_published_location):
+    response = client.get("/sitemap.xml")
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode()
+    assert "/sitemap-posts-0.xml" in content
+    assert "/sitemap-categories.xml" in content
+    assert "/sitemap-profiles.xml" in content
+
+    response = client.get("/sitemap-posts-0.xml")
+    assert response.status_code == HTTPStatus.OK
+    assert (f"/posts/{post_with_published_location.id}/"
+            in response.content.decode())
+
+
+@pytest.mark.django_db
+def test_build_sitemaps_rebuilds_changed_chunks_only(
+        tmp_path, settings, post_with_published_location):
+    settings.SITEMAP_ROOT = tmp_path
+    call_command("build_sitemaps", domain="example.com")
+    chunk = tmp_path / "sitemap-posts-0.xml"
+    assert "https://example.com/posts/" in chunk.read_text()
+    mtime = chunk.stat().st_mtime_ns
+
+    call_command("build_sitemaps", domain="example.com")
+    assert chunk.stat().st_mtime_ns == mtime
+
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    call_command("build_sitemaps", domain="example.com")
+    assert chunk.stat().st_mtime_ns != mtime
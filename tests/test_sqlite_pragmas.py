@@ -0,0 +1,34 @@
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test.utils import override_settings
+
+PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "busy_timeout": 5000,
+    "temp_store": "memory",
+}
+
+
+@pytest.mark.django_db
+@override_settings(SQLITE_PRAGMAS=PRAGMAS)
+def test_pragmas_are_applied_to_new_connections(tmp_path):
+    wrapper = DatabaseWrapper(
+        {**connection.settings_dict, "NAME": str(tmp_path / "db.sqlite3")},
+        alias="pragmas",
+    )
+    try:
+        with wrapper.cursor() as cursor:
+            values = {}
+            for name in PRAGMAS:
+                cursor.execute(f"PRAGMA {name}")
+                values[name] = cursor.fetchone()[0]
+    finally:
+        wrapper.close()
+    assert values == {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "busy_timeout": 5000,
+        "temp_store": 2,
+    }, "Убедитесь, что SQLITE_PRAGMAS применяются к каждому соединению."
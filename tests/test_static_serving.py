@@ -0,0 +1,81 @@
+import pytest
+from django.http import Http404
+from django.test import RequestFactory
+
+from blogicum import staticfiles
+
+HASHED = "css/site.0123456789ab.css"
+PLAIN = "css/plain.css"
+
+
+@pytest.fixture
+def static_root(tmp_path, settings, monkeypatch):
+    css = tmp_path / "css"
+    css.mkdir()
+    (css / "site.0123456789ab.css").write_bytes(b"body{}")
+    (css / "site.0123456789ab.css.br").write_bytes(b"br")
+    (css / "site.0123456789ab.css.gz").write_bytes(b"gz")
+    (css / "plain.css").write_bytes(b"p{}")
+    settings.STATIC_ROOT = tmp_path
+    monkeypatch.setattr(staticfiles, "hashed_names", {HASHED})
+    return tmp_path
+
+
+def fetch(path, accept_encoding=None):
+    extra = {}
+    if accept_encoding is not None:
+        extra["HTTP_ACCEPT_ENCODING"] = accept_encoding
+    request = RequestFactory().get(f"/static/{path}", **extra)
+    response = staticfiles.serve(request, path)
+    with response.file_to_stream:
+        body = b"".join(response.streaming_content)
+    return response, body
+
+
+@pytest.mark.parametrize("accept, encoding, body", (
+    ("gzip, deflate, br", "br", b"br"),
+    ("gzip;q=1.0, deflate", "gzip", b"gz"),
+))
+def test_serves_precompressed_variant(static_root, accept, encoding, body):
+    response, content = fetch(HASHED, accept)
+    assert response["Content-Encoding"] == encoding, (
+        "Убедитесь, что клиенту отдаётся заранее сжатый вариант файла."
+    )
+    assert content == body
+    assert response["Content-Type"].startswith("text/css"), (
+        "Убедитесь, что Content-Type определяется по исходному файлу."
+    )
+    assert response["Vary"] == "Accept-Encoding"
+
+
+def test_hashed_file_is_immutable(static_root):
+    response, _ = fetch(HASHED, "br")
+    assert response["Cache-Control"] == staticfiles.IMMUTABLE, (
+        "Убедитесь, что файлы с хешем в имени кэшируются навсегда."
+    )
+
+
+def test_unhashed_file_is_revalidated(static_root):
+    response, _ = fetch(PLAIN, "br")
+    assert response["Cache-Control"] == "no-cache", (
+        "Убедитесь, что файлы без хеша в имени перепроверяются клиентом."
+    )
+
+
+@pytest.mark.parametrize("path, accept, body", (
+    (HASHED, None, b"body{}"),
+    (HASHED, "deflate", b"body{}"),
+    (PLAIN, "gzip, br", b"p{}"),
+))
+def test_falls_back_to_uncompressed_file(static_root, path, accept, body):
+    response, content = fetch(path, accept)
+    assert "Content-Encoding" not in response, (
+        "Убедитесь, что без подходящего сжатого варианта отдаётся "
+        "исходный файл."
+    )
+    assert content == body
+
+
+def test_missing_file_is_404(static_root):
+    with pytest.raises(Http404):
+        fetch("css/missing.css", "br")
@@ -0,0 +1,28 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_change_stats_of_feed_slice(
+        many_posts_with_published_locations):
+    posts = Post.objects.published()
+    newest = max(post.updated_at for post in posts[:5])
+    with CaptureQueriesContext(connection) as queries:
+        stats = posts[:5].change_stats()
+    assert len(queries) == 1
+    assert stats["count"] == 5
+    assert stats["last_updated"] >= newest
+
+
+@pytest.mark.django_db
+def test_comment_updates_post(post_with_published_location, user, mixer):
+    updated_at = post_with_published_location.updated_at
+    mixer.blend("blog.Comment", post=post_with_published_location,
+                author=user)
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.updated_at > updated_at, (
+        "Убедитесь, что новый комментарий обновляет `updated_at` поста."
+    )
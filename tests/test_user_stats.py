@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import archive
+from blog import stats as stats_module
+from blog.models import Comment, Post, UserStats
+
+
+def stats_of(user):
+    return UserStats.objects.get(user=user)
+
+
+@pytest.mark.django_db
+def test_stats_follow_posts_and_comments(
+        mixer, user, another_user, published_category):
+    post = mixer.blend(Post, author=user, category=published_category,
+                       is_published=True, pub_date="2020-01-01T00:00Z")
+    mixer.blend(Post, author=user, category=published_category,
+                is_published=False)
+    comment = mixer.blend(Comment, post=post, author=another_user)
+    stats = stats_of(user)
+    assert (stats.posts, stats.published_posts,
+            stats.comments_received) == (2, 1, 1), (
+        "Убедитесь, что статистика пользователя обновляется при создании "
+        "публикаций и комментариев."
+    )
+    assert stats_of(another_user).last_activity is not None
+
+    post.is_published = False
+    post.save()
+    comment.delete()
+    stats = stats_of(user)
+    assert (stats.posts, stats.published_posts,
+            stats.comments_received) == (2, 0, 0)
+
+    post.delete()
+    assert stats_of(user).posts == 1
+
+
+@pytest.mark.django_db
+def test_repair_user_stats(client, user, post_with_published_location):
+    UserStats.objects.filter(user=user).update(posts=100)
+    call_command("repair_user_stats")
+    assert stats_of(user).posts == 1, (
+        "Убедитесь, что команда repair_user_stats пересчитывает статистику."
+    )
+    response = client.get(f"/profile/{user.username}/")
+    assert response.status_code == HTTPStatus.OK
+    assert "Публикаций: 1" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_archived_posts_stay_in_stats(
+        monkeypatch, mixer, user, another_user, published_category):
+    post = mixer.blend(Post, author=user, category=published_category,
+                       is_published=True, pub_date="2020-01-01T00:00Z")
+    mixer.cycle(2).blend(Comment, post=post, author=another_user)
+    mixer.blend(Post, author=another_user, category=published_category,
+                is_published=True, pub_date="2020-01-01T00:00Z")
+    list(archive.archive_posts(timezone.now()))
+    assert not Post.objects.exists()
+    totals = (1, 1, 2)
+    stats = stats_of(user)
+    assert (stats.posts, stats.published_posts,
+            stats.comments_received) == totals, (
+        "Убедитесь, что перенос публикаций в архив не уменьшает "
+        "статистику автора."
+    )
+
+    monkeypatch.setattr(stats_module, "RECOUNT_BATCH_SIZE", 1)
+    assert stats_module.recount() == 2
+    stats = stats_of(user)
+    assert (stats.posts, stats.published_posts,
+            stats.comments_received) == totals, (
+        "Убедитесь, что пересчёт статистики учитывает архивные публикации."
+    )
+    assert stats_of(another_user).posts == 1
+
+
+@pytest.mark.django_db
+def test_recount_agrees_on_last_activity(
+        mixer, user, another_user, published_category):
+    post = mixer.blend(Post, author=user, category=published_category,
+                       is_published=True, pub_date="2020-01-01T00:00Z")
+    mixer.blend(Comment, post=post, author=another_user)
+    published_category.is_published = False
+    published_category.save()
+    before = stats_of(user).last_activity
+    assert before == post.created_at, (
+        "Убедитесь, что последняя активность — время последней записи "
+        "самого пользователя, а не изменения его публикаций."
+    )
+    stats_module.recount([user.pk, another_user.pk])
+    assert stats_of(user).last_activity == before, (
+        "Убедитесь, что пересчёт статистики даёт ту же последнюю "
+        "активность, что и обновления по сигналам."
+    )
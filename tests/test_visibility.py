@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Category, Post
+
+
+@pytest.mark.django_db
+def test_category_toggle_recomputes_post_visibility(
+        mixer, user, published_category):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1)
+    )
+    assert Post.objects.published().count() == len(posts)
+
+    category = Category.objects.get(pk=published_category.pk)
+    category.is_published = False
+    with CaptureQueriesContext(connection) as queries:
+        category.save()
+    updates = [
+        q for q in queries.captured_queries
+        if q["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 1, (
+        "Убедитесь, что при снятии категории с публикации видимость постов "
+        "пересчитывается одним запросом UPDATE."
+    )
+    assert not Post.objects.published().exists()
+
+    category.is_published = True
+    category.save()
+    assert Post.objects.published().count() == len(posts)
+
+
+@pytest.mark.django_db
+def test_deleted_category_hides_posts(mixer, user, published_category):
+    mixer.blend("blog.Post", author=user, category=published_category)
+    published_category.delete()
+    assert not Post.objects.published().exists()
@@ -0,0 +1,47 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.template import engines
+from django.test.utils import override_settings
+
+from blogicum import settings_production
+from blogicum.warmup import iter_template_names, warm_up
+
+
+def test_warm_templates_command_compiles_every_template():
+    out = StringIO()
+    call_command("warm_templates", stdout=out)
+    output = out.getvalue()
+    names = list(iter_template_names())
+    assert "blog/index.html" in names
+    for name in names:
+        assert name in output, (
+            "Убедитесь, что команда `warm_templates` компилирует "
+            f"шаблон `{name}`."
+        )
+    assert f"{len(names)} templates compiled" in output, (
+        "Убедитесь, что команда `warm_templates` выводит число "
+        "скомпилированных шаблонов."
+    )
+
+
+@override_settings(
+    TEMPLATES=settings_production.TEMPLATES, WARM_UP_TEMPLATES=True
+)
+def test_warm_up_fills_cached_loader():
+    engine = engines["django"]
+    loader, = engine.engine.template_loaders
+    assert loader.__module__ == "django.template.loaders.cached", (
+        "Убедитесь, что в production-настройках шаблоны загружаются "
+        "кэширующим загрузчиком."
+    )
+    assert not loader.get_template_cache
+    warm_up()
+    assert "blog/index.html" in loader.get_template_cache, (
+        "Убедитесь, что прогрев сохраняет скомпилированные шаблоны "
+        "в кэше загрузчика."
+    )
+    compiled = loader.get_template_cache["blog/index.html"]
+    assert engine.get_template("blog/index.html").template is compiled, (
+        "Убедитесь, что после прогрева шаблон не компилируется повторно."
+    )